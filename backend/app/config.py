@@ -4,3 +4,54 @@ from dotenv import load_dotenv
 load_dotenv()
 
 YOUTUBE_API_KEY = os.getenv("YOUTUBE_API_KEY")
+
+# Concurrent channel fetching (own channel + competitors)
+CHANNEL_FETCH_TIMEOUT = float(os.getenv("CHANNEL_FETCH_TIMEOUT", "20"))
+CHANNEL_FETCH_WORKERS = int(os.getenv("CHANNEL_FETCH_WORKERS", "6"))
+
+# YouTube API response cache (set YOUTUBE_CACHE_PATH="" to disable)
+YOUTUBE_CACHE_PATH = os.getenv("YOUTUBE_CACHE_PATH", "./youtube_cache.db")
+YOUTUBE_CACHE_MAX_ENTRIES = int(os.getenv("YOUTUBE_CACHE_MAX_ENTRIES", "5000"))
+
+# YouTube API quota scheduling
+YOUTUBE_DAILY_QUOTA = int(os.getenv("YOUTUBE_DAILY_QUOTA", "10000"))
+YOUTUBE_QUOTA_BURST = int(os.getenv("YOUTUBE_QUOTA_BURST", "2000"))
+YOUTUBE_QUOTA_MAX_WAIT = float(os.getenv("YOUTUBE_QUOTA_MAX_WAIT", "10"))
+YOUTUBE_QUOTA_BACKGROUND_RESERVE = int(
+    os.getenv("YOUTUBE_QUOTA_BACKGROUND_RESERVE", "500")
+)
+
+# Which YouTube client to use: "live", "synthetic" (generated data),
+# "replay" (recorded fixtures) or "record" (live + save fixtures)
+YOUTUBE_BACKEND = os.getenv("YOUTUBE_BACKEND", "live")
+YOUTUBE_FIXTURES_PATH = os.getenv(
+    "YOUTUBE_FIXTURES_PATH", "./youtube_fixtures.json"
+)
+YOUTUBE_FAKE_LATENCY_MS = float(os.getenv("YOUTUBE_FAKE_LATENCY_MS", "0"))
+YOUTUBE_FAKE_ERROR_RATE = float(os.getenv("YOUTUBE_FAKE_ERROR_RATE", "0"))
+
+# Background analysis jobs
+ANALYSIS_JOB_WORKERS = int(os.getenv("ANALYSIS_JOB_WORKERS", "4"))
+
+# Database: SQLite by default, e.g. postgresql+psycopg2://user:pw@host/db
+DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./users.db")
+# Async driver URL for the async routes; derived from DATABASE_URL
+# (aiosqlite / asyncpg) when unset
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL")
+# Connection pool (PostgreSQL and other server databases)
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "10"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+# SQLite pragmas
+SQLITE_CACHE_SIZE_KB = int(os.getenv("SQLITE_CACHE_SIZE_KB", "65536"))
+SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+
+# Cold storage: runs older than ARCHIVE_AFTER_DAYS (except each user's
+# latest ARCHIVE_KEEP_LATEST) move to Parquet under ARCHIVE_PATH when
+# `python -m app.services.run_archive` runs (e.g. from a daily cron job).
+# Off unless ARCHIVE_AFTER_DAYS is set to a positive number of days.
+ARCHIVE_PATH = os.getenv("ARCHIVE_PATH", "./archive")
+ARCHIVE_AFTER_DAYS = int(os.getenv("ARCHIVE_AFTER_DAYS", "0"))
+ARCHIVE_KEEP_LATEST = int(os.getenv("ARCHIVE_KEEP_LATEST", "5"))
+ARCHIVE_COMPRESSION = os.getenv("ARCHIVE_COMPRESSION", "zstd")
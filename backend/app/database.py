@@ -1,18 +1,113 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import (
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine
+)
 from sqlalchemy.orm import sessionmaker, declarative_base
 
-DATABASE_URL = "sqlite:///./users.db"
-
-engine = create_engine(
-    DATABASE_URL, connect_args={"check_same_thread": False}
+from app.config import (
+    DATABASE_URL,
+    ASYNC_DATABASE_URL,
+    DB_POOL_SIZE,
+    DB_MAX_OVERFLOW,
+    DB_POOL_TIMEOUT,
+    DB_POOL_RECYCLE,
+    SQLITE_CACHE_SIZE_KB,
+    SQLITE_BUSY_TIMEOUT_MS
 )
 
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    # WAL lets dashboard reads run while an analysis is being written;
+    # NORMAL is durable in WAL mode except for the last commits on power
+    # loss. Writers wait for the lock instead of failing immediately.
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute(f"PRAGMA cache_size=-{SQLITE_CACHE_SIZE_KB}")
+    cursor.execute(f"PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT_MS}")
+    cursor.close()
+
+
+def create_app_engine(url: str = DATABASE_URL):
+    if url.startswith("sqlite"):
+        engine = create_engine(
+            url,
+            connect_args={
+                "check_same_thread": False,
+                "timeout": SQLITE_BUSY_TIMEOUT_MS / 1000,
+            }
+        )
+        event.listen(engine, "connect", _set_sqlite_pragmas)
+        return engine
+
+    return create_engine(
+        url,
+        pool_size=DB_POOL_SIZE,
+        max_overflow=DB_MAX_OVERFLOW,
+        pool_timeout=DB_POOL_TIMEOUT,
+        pool_recycle=DB_POOL_RECYCLE,
+        pool_pre_ping=True
+    )
+
+
+def to_async_url(url: str) -> str:
+    """Same database through its asyncio driver."""
+    scheme, rest = url.split("://", 1)
+    dialect = scheme.split("+")[0]
+    drivers = {"sqlite": "aiosqlite", "postgresql": "asyncpg"}
+    if dialect not in drivers:
+        raise ValueError(
+            f"No async driver known for {dialect}: set ASYNC_DATABASE_URL "
+            f"to an asyncio URL of the same database"
+        )
+    return f"{dialect}+{drivers[dialect]}://{rest}"
+
+
+def create_async_app_engine(url: str = None):
+    url = url or ASYNC_DATABASE_URL or to_async_url(DATABASE_URL)
+    if url.startswith("sqlite"):
+        engine = create_async_engine(
+            url, connect_args={"timeout": SQLITE_BUSY_TIMEOUT_MS / 1000}
+        )
+        event.listen(engine.sync_engine, "connect", _set_sqlite_pragmas)
+        return engine
+
+    return create_async_engine(
+        url,
+        pool_size=DB_POOL_SIZE,
+        max_overflow=DB_MAX_OVERFLOW,
+        pool_timeout=DB_POOL_TIMEOUT,
+        pool_recycle=DB_POOL_RECYCLE,
+        pool_pre_ping=True
+    )
+
+
+engine = create_app_engine()
+
 SessionLocal = sessionmaker(
     autocommit=False,
     autoflush=False,
     bind=engine
 )
 
+# Created on first use, so a DATABASE_URL without a known async driver
+# only fails the async routes, with a clear message, not app startup
+_async_session_factory = None
+
+
+def get_async_sessionmaker():
+    global _async_session_factory
+    if _async_session_factory is None:
+        _async_session_factory = async_sessionmaker(
+            create_async_app_engine(),
+            class_=AsyncSession,
+            autoflush=False,
+            expire_on_commit=False
+        )
+    return _async_session_factory
+
 Base = declarative_base()
 
 # ✅ ADD THIS FUNCTION
@@ -22,3 +117,12 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+async def get_async_db():
+    """
+    AsyncSession for async routes. Existing sync helpers run on it via
+    `await db.run_sync(helper, ...)`, which passes them a regular Session.
+    """
+    async with get_async_sessionmaker()() as db:
+        yield db
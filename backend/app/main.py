@@ -2,10 +2,20 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.database import Base, engine
+from app.migrations import run_migrations
 
 # ✅ MODELS (import FIRST so tables exist)
 from app.models.user import User
-from app.models.analysis import AnalysisRun, Video
+from app.models.analysis import (
+    AnalysisRun,
+    Video,
+    ChannelHandle,
+    AnalysisJob,
+    AnalysisSummary,
+    TitleTerm,
+    VideoSnapshot,
+    VideoStatsHead
+)
 
 # ✅ ROUTES
 from app.routes.auth import router as auth_router
@@ -17,9 +27,13 @@ from app.routes.analytics_routes import router as analytics_router
 from app.routes.analyze_csv import router as analyze_csv_router
 from app.routes.history import router as history_router
 from app.routes.users import router as users_router
+from app.routes.export import router as export_router
+from app.services.trending_cache import start_trending_refresher
+from app.services.analysis_jobs import resume_pending_jobs
 
 # ✅ CREATE TABLES ONCE
 Base.metadata.create_all(bind=engine)
+run_migrations(engine)
 
 app = FastAPI(title="Social Media Analyzer API")
 
@@ -42,6 +56,14 @@ app.include_router(analytics_router)
 app.include_router(analyze_csv_router)
 app.include_router(history_router)
 app.include_router(users_router)
+app.include_router(export_router)
+
+
+@app.on_event("startup")
+def start_background_workers():
+    start_trending_refresher()
+    resume_pending_jobs()
+
 
 @app.get("/")
 def home():
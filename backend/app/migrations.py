@@ -0,0 +1,41 @@
+from sqlalchemy import inspect
+
+from app.database import Base
+
+
+def create_missing_indexes(engine):
+    """
+    create_all only builds indexes together with new tables, so indexes
+    added to existing models are created here.
+    """
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=engine, checkfirst=True)
+
+
+def add_missing_columns(engine):
+    """
+    Adds nullable columns that were added to existing models. Only plain
+    ADD COLUMN is supported; anything else needs a manual migration.
+    """
+    inspector = inspect(engine)
+    existing_tables = set(inspector.get_table_names())
+
+    with engine.begin() as connection:
+        for table in Base.metadata.sorted_tables:
+            if table.name not in existing_tables:
+                continue
+            existing = {c["name"] for c in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing:
+                    continue
+                column_type = column.type.compile(dialect=engine.dialect)
+                connection.exec_driver_sql(
+                    f'ALTER TABLE {table.name} '
+                    f'ADD COLUMN {column.name} {column_type}'
+                )
+
+
+def run_migrations(engine):
+    add_missing_columns(engine)
+    create_missing_indexes(engine)
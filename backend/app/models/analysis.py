@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, Float, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, Float, ForeignKey, JSON, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.database import Base
@@ -14,6 +14,16 @@ class AnalysisRun(Base):
 
     videos = relationship("Video", back_populates="analysis")
 
+    __table_args__ = (
+        # history / latest / previous-run lookups
+        Index("ix_analysis_runs_user_analyzed", "user_id", "analyzed_at"),
+        # incremental mode: latest run of one channel
+        Index(
+            "ix_analysis_runs_user_channel_analyzed",
+            "user_id", "channel_url", "analyzed_at"
+        ),
+    )
+
 
 class Video(Base):
     __tablename__ = "videos"
@@ -28,4 +38,129 @@ class Video(Base):
     engagement_rate = Column(Float)
 
     analysis = relationship("AnalysisRun", back_populates="videos")
-    source = Column(String, default="own") 
\ No newline at end of file
+    source = Column(String, default="own") 
+
+    __table_args__ = (
+        # per-source aggregates and best/worst lists of one run
+        Index(
+            "ix_videos_analysis_source_engagement",
+            "analysis_id", "source", "engagement_rate"
+        ),
+    )
+
+
+class ChannelHandle(Base):
+    __tablename__ = "channel_handles"
+
+    handle = Column(String, primary_key=True)  # lowercased, without "@"
+    channel_id = Column(String, nullable=True)  # None = handle not found
+    resolved_at = Column(DateTime, default=datetime.utcnow)
+
+
+class QuotaUsage(Base):
+    """YouTube API units spent per quota day, across every worker."""
+    __tablename__ = "youtube_quota_usage"
+
+    day = Column(String, primary_key=True)  # YYYY-MM-DD, Pacific time
+    units = Column(Integer, default=0)
+
+
+class AnalysisJob(Base):
+    __tablename__ = "analysis_jobs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    analysis_id = Column(Integer, ForeignKey("analysis_runs.id"))
+    user_id = Column(Integer, nullable=True)
+    status = Column(String, default="queued")  # queued/running/done/failed
+    progress = Column(Integer, default=0)  # percent
+    params = Column(JSON)
+    result = Column(JSON, nullable=True)
+    error = Column(String, nullable=True)
+    # Failed on the YouTube quota: when to retry (UTC)
+    retry_at = Column(DateTime, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        Index("ix_analysis_jobs_status_created", "status", "created_at"),
+    )
+
+
+class AnalysisSummary(Base):
+    """Aggregates of one run, written at ingest so reads skip the videos."""
+    __tablename__ = "analysis_summaries"
+
+    analysis_id = Column(
+        Integer, ForeignKey("analysis_runs.id"), primary_key=True
+    )
+
+    # All sources together (used by /analyze/analysis/{id}/summary)
+    total_videos = Column(Integer, default=0)
+    avg_views = Column(Float, default=0)
+    avg_engagement = Column(Float, default=0)
+    top_videos = Column(JSON)  # best 2, all sources
+    low_videos = Column(JSON)  # worst 1, all sources
+
+    own_total_videos = Column(Integer, default=0)
+    own_avg_views = Column(Float, default=0)
+    own_avg_engagement = Column(Float, default=0)
+    own_engagement_percentiles = Column(JSON)  # p25 / p50 / p75 / p90
+    own_high_performers = Column(Integer, default=0)  # above avg
+    own_low_performers = Column(Integer, default=0)  # below 60% of avg
+    own_videos = Column(JSON)  # all own videos, best first
+    own_best_videos = Column(JSON)
+    own_worst_videos = Column(JSON)
+    own_topics = Column(JSON)
+    own_velocity = Column(JSON)  # from the snapshot history at ingest
+
+    competitor_total_videos = Column(Integer, default=0)
+    competitor_avg_views = Column(Float, default=0)
+    competitor_avg_engagement = Column(Float, default=0)
+    competitor_topics = Column(JSON)
+
+    updated_at = Column(DateTime, default=datetime.utcnow)
+
+
+class TitleTerm(Base):
+    """Engagement-weighted title words of one run, built at ingest."""
+    __tablename__ = "title_terms"
+
+    analysis_id = Column(
+        Integer, ForeignKey("analysis_runs.id"), primary_key=True
+    )
+    source = Column(String, primary_key=True)
+    term = Column(String, primary_key=True)
+    score = Column(Float)
+
+    __table_args__ = (
+        Index(
+            "ix_title_terms_analysis_source_score",
+            "analysis_id", "source", "score"
+        ),
+    )
+
+
+class VideoSnapshot(Base):
+    """
+    Statistics of one YouTube video over time, shared by every run and
+    user that fetched it. Counts are deltas from the previous snapshot
+    of the video (the first one is relative to 0).
+    """
+    __tablename__ = "video_snapshots"
+
+    video_id = Column(String, primary_key=True)
+    captured_at = Column(DateTime, primary_key=True)
+    views_delta = Column(Integer, default=0)
+    likes_delta = Column(Integer, default=0)
+    comments_delta = Column(Integer, default=0)
+
+
+class VideoStatsHead(Base):
+    """Latest absolute counts of a video: the base of its next delta."""
+    __tablename__ = "video_stats_heads"
+
+    video_id = Column(String, primary_key=True)
+    views = Column(Integer, default=0)
+    likes = Column(Integer, default=0)
+    comments = Column(Integer, default=0)
+    captured_at = Column(DateTime)
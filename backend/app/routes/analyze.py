@@ -1,8 +1,21 @@
-from fastapi import APIRouter, Depends, HTTPException
+from datetime import datetime
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from app.youtube.youtube_fetch import fetch_channel_videos
-from app.database import get_db
-from app.models.analysis import AnalysisRun, Video
+from app.services.incremental_analysis import find_previous_run
+from app.services.analysis_jobs import submit_job
+from app.services.analysis_summary import get_summary
+from app.services.analysis_history import (
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE,
+    InvalidCursor,
+    history_page,
+    with_archived
+)
+from app.database import get_db, get_async_db
+from app.models.analysis import AnalysisRun, AnalysisJob
 from app.dependencies.auth import get_current_user
 
 
@@ -10,8 +23,12 @@ router = APIRouter(prefix="/analyze", tags=["analyze"])
 from app.models.user import User
  # or wherever you get user
 
+# Uploads are paged through playlistItems.list (1 unit per 50 videos),
+# so a few hundred videos per channel are affordable.
+MAX_VIDEOS_PER_CHANNEL = 500
+
 
-@router.post("/youtube")
+@router.post("/youtube", status_code=202)
 def analyze_youtube(
     data: dict,
     db: Session = Depends(get_db),
@@ -36,8 +53,10 @@ def analyze_youtube(
             detail="competitor_max_results must be a positive integer"
         )
 
-    own_max_results = min(own_max_results, 50)
-    competitor_max_results = min(competitor_max_results, 50)
+    own_max_results = min(own_max_results, MAX_VIDEOS_PER_CHANNEL)
+    competitor_max_results = min(
+        competitor_max_results, MAX_VIDEOS_PER_CHANNEL
+    )
 
     if not isinstance(competitor_urls, list):
         raise HTTPException(
@@ -56,60 +75,76 @@ def analyze_youtube(
             detail="At most 5 competitors allowed"
         )
 
-    videos_data = fetch_channel_videos(
-        channel_url, max_results=own_max_results
-    )
-
-
-    analysis = AnalysisRun(
-        channel_url=channel_url,
-        user_id=current_user.id
-     )
+    # Incremental mode: update the last run of this channel in place
+    previous = (
+        find_previous_run(db, current_user.id, channel_url)
+        if data.get("incremental") else None
+    )
 
-    db.add(analysis)
+    if previous:
+        analysis = previous
+    else:
+        analysis = AnalysisRun(
+            channel_url=channel_url,
+            user_id=current_user.id
+        )
+        db.add(analysis)
+        db.flush()
+
+    job = AnalysisJob(
+        analysis_id=analysis.id,
+        user_id=current_user.id,
+        params={
+            "channel_url": channel_url,
+            "competitor_urls": competitor_urls,
+            "own_max_results": own_max_results,
+            "competitor_max_results": competitor_max_results,
+            "incremental": previous is not None,
+        }
+    )
+    db.add(job)
     db.commit()
-    db.refresh(analysis)
-
-
-    for v in videos_data:
-        video = Video(
-            analysis_id=analysis.id,
-            video_id=v["video_id"],
-            title=v["title"],
-            views=v["views"],
-            likes=v["likes"],
-            comments=v["comments"],
-            engagement_rate=v["engagement_rate"],
-            source="own"
-        )
-        db.add(video)
-
-    competitor_video_count = 0
-    for competitor_url in competitor_urls:
-        competitor_videos = fetch_channel_videos(
-            competitor_url, max_results=competitor_max_results
-        )
-        for v in competitor_videos:
-            competitor_video_count += 1
-            video = Video(
-                analysis_id=analysis.id,
-                video_id=v["video_id"],
-                title=v["title"],
-                views=v["views"],
-                likes=v["likes"],
-                comments=v["comments"],
-                engagement_rate=v["engagement_rate"],
-                source="competitor"
-            )
-            db.add(video)
-
-    db.commit()
+
+    # Fetching happens on the job worker pool, poll /analyze/jobs/{id}
+    submit_job(job.id)
 
     return {
         "analysis_id": analysis.id,
-        "total_videos": len(videos_data),
-        "competitor_channels": len(competitor_urls),
-        "competitor_videos": competitor_video_count
+        "job_id": job.id,
+        "status": job.status
+    }
+
+
+@router.get("/jobs/{job_id}")
+def get_analysis_job(
+    job_id: int,
+    response: Response,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    job = db.query(AnalysisJob).filter(
+        AnalysisJob.id == job_id,
+        AnalysisJob.user_id == current_user.id
+    ).first()
+
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    # Failed on the YouTube quota: tell the client when to resubmit
+    if job.status == "failed" and job.retry_at:
+        seconds = (job.retry_at - datetime.utcnow()).total_seconds()
+        response.headers["Retry-After"] = str(max(int(seconds), 1))
+
+    return {
+        "job_id": job.id,
+        "analysis_id": job.analysis_id,
+        "status": job.status,
+        "progress": job.progress,
+        "result": job.result,
+        "error": job.error,
+        "retry_at": job.retry_at,
+        "created_at": job.created_at,
+        "updated_at": job.updated_at,
     }
 
 
@@ -128,40 +163,21 @@ def get_analysis_summary(
     if not analysis:
         raise HTTPException(status_code=404, detail="Analysis not found")
 
-    videos = db.query(Video).filter(
-        Video.analysis_id == analysis_id
-    ).all()
-
-    if not videos:
-        raise HTTPException(status_code=404, detail="No videos found")
+    summary = get_summary(db, analysis_id)
 
-    total = len(videos)
-    avg_views = sum(v.views for v in videos) / total
-    avg_engagement = sum(v.engagement_rate for v in videos) / total
+    if summary is None:
+        raise HTTPException(status_code=404, detail="Analysis is still running")
 
-    sorted_videos = sorted(
-        videos,
-        key=lambda x: x.engagement_rate,
-        reverse=True
-    )
+    if not summary.total_videos:
+        raise HTTPException(status_code=404, detail="No videos found")
 
     return {
         "analysis_id": analysis_id,
-        "total_videos": total,
-        "avg_views": round(avg_views, 2),
-        "avg_engagement": round(avg_engagement, 4),
-        "top_videos": [
-            {
-                "title": v.title,
-                "engagement_rate": v.engagement_rate
-            } for v in sorted_videos[:2]
-        ],
-        "low_videos": [
-            {
-                "title": v.title,
-                "engagement_rate": v.engagement_rate
-            } for v in sorted_videos[-1:]
-        ]
+        "total_videos": summary.total_videos,
+        "avg_views": round(summary.avg_views, 2),
+        "avg_engagement": round(summary.avg_engagement, 4),
+        "top_videos": summary.top_videos,
+        "low_videos": summary.low_videos
     }
 
 @router.get("/analysis/latest")
@@ -186,25 +202,35 @@ def get_latest_analysis(
     }
 
 @router.get("/analysis/history")
-def get_analysis_history(
-    db: Session = Depends(get_db),
+async def get_analysis_history(
+    cursor: str | None = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    include_archived: bool = False,
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
-    analyses = (
-        db.query(AnalysisRun)
-        .filter(AnalysisRun.user_id == current_user.id)
-        .order_by(AnalysisRun.analyzed_at.desc())
-        .all()
-    )
+    try:
+        page = await db.run_sync(
+            history_page, current_user.id, cursor=cursor, limit=limit
+        )
+        if include_archived:
+            page = await run_in_threadpool(
+                with_archived, page, current_user.id,
+                cursor=cursor, limit=limit
+            )
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
-    if not analyses:
-        return []
-
-    return [
-        {
-            "analysis_id": a.id,
-            "channel_url": a.channel_url,
-            "created_at": a.analyzed_at,
-        }
-        for a in analyses
-    ]
+    return {
+        "items": [
+            {
+                "analysis_id": a["id"],
+                "channel_url": a["channel_url"],
+                "created_at": a["analyzed_at"],
+                "archived": a["archived"],
+            }
+            for a in page["items"]
+        ],
+        "has_more": page["has_more"],
+        "next_cursor": page["next_cursor"],
+    }
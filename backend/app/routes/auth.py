@@ -5,23 +5,12 @@ import bcrypt
 from app.utils.jwt import create_access_token
 
 
-from app.database import SessionLocal
+from app.database import get_db
 from app.models.user import User
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
 
-# =======================
-# DB DEPENDENCY
-# =======================
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
-
 # =======================
 # SCHEMAS
 # =======================
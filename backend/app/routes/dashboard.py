@@ -1,134 +1,124 @@
-from fastapi import APIRouter, Depends, HTTPException
+from datetime import datetime
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from app.database import get_db
-from app.models.analysis import AnalysisRun, Video
+from app.database import get_async_db
+from app.models.analysis import AnalysisRun
 from app.dependencies.auth import get_current_user
+from app.services.analysis_summary import (
+    get_summary,
+    previous_own_avg_engagement,
+    engagement_trend,
+    downsample
+)
+from app.services.run_archive import archived_trend
 
 
 router = APIRouter(prefix="/analysis", tags=["dashboard"])
+
+MAX_TREND_POINTS = 500
+
+
+@router.get("/trend")
+async def get_engagement_trend(
+    start: datetime | None = None,
+    end: datetime | None = None,
+    points: int = Query(MAX_TREND_POINTS, ge=1, le=MAX_TREND_POINTS),
+    include_archived: bool = False,
+    db: AsyncSession = Depends(get_async_db),
+    current_user = Depends(get_current_user)
+):
+    """Avg own engagement of every analysis run, oldest first."""
+    trend = await db.run_sync(
+        engagement_trend, current_user.id, start=start, end=end
+    )
+    if include_archived:
+        # Archived runs are all older than the live ones
+        trend = await run_in_threadpool(
+            archived_trend, current_user.id, start=start, end=end
+        ) + trend
+    sampled = downsample(trend, points)
+
+    return {
+        "total_runs": len(trend),
+        "points": [
+            {
+                "analysis_id": analysis_id,
+                "analyzed_at": analyzed_at,
+                "engagement": round(engagement, 4)
+            }
+            for analysis_id, analyzed_at, engagement in sampled
+        ]
+    }
+
 
 @router.get("/{analysis_id}/dashboard")
-def get_dashboard_data(
+async def get_dashboard_data(
     analysis_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user = Depends(get_current_user)  # ✅ REQUIRED
-):   
+):
+    return await db.run_sync(_dashboard_data, analysis_id, current_user.id)
+
+
+def _dashboard_data(db: Session, analysis_id: int, user_id: int):
     # 1️⃣ Check analysis belongs to logged-in user
 
     analysis = db.query(AnalysisRun).filter(
         AnalysisRun.id == analysis_id,
-        AnalysisRun.user_id == current_user.id
+        AnalysisRun.user_id == user_id
     ).first()
 
     if not analysis:
         raise HTTPException(status_code=404, detail="Analysis not found")
 
-    # 2️⃣ Fetch videos
-    own_videos = db.query(Video).filter(
-        Video.analysis_id == analysis_id,
-        Video.source == "own"
-    ).all()
+    # 2️⃣ Precomputed aggregates of this run
+    summary = get_summary(db, analysis_id)
 
-    competitor_videos = db.query(Video).filter(
-        Video.analysis_id == analysis_id,
-        Video.source == "competitor"
-    ).all()
-
-    if not own_videos:
+    if summary is None:
+        raise HTTPException(
+            status_code=404,
+            detail="Analysis is still running"
+        )
+
+    if not summary.own_total_videos:
         raise HTTPException(
             status_code=404,
             detail="No own channel videos found"
         )
 
-    # 3️⃣ Helpers
-    def avg_engagement(videos):
-        return (
-            sum(v.engagement_rate for v in videos) / len(videos)
-            if videos else 0
-        )
-
-    def avg_views(videos):
-        return (
-            sum(v.views for v in videos) / len(videos)
-            if videos else 0
-        )
-
-    # 4️⃣ Sort
-    own_sorted = sorted(
-        own_videos,
-        key=lambda x: x.engagement_rate,
-        reverse=True
-    )
+    # 3️⃣ Previous analysis (for growth comparison)
+    previous_avg_engagement = previous_own_avg_engagement(db, analysis)
+    has_previous = previous_avg_engagement is not None
 
-    comp_sorted = sorted(
-        competitor_videos,
-        key=lambda x: x.engagement_rate,
-        reverse=True
-    )
-
-    # 5️⃣ Previous analysis (for growth comparison)
-    previous = (
-        db.query(AnalysisRun)
-        .filter(
-            AnalysisRun.user_id == current_user.id,
-            AnalysisRun.analyzed_at < analysis.analyzed_at
-        )
-        .order_by(AnalysisRun.analyzed_at.desc())
-        .first()
-    )
-
-    previous_avg_engagement = None
-    has_previous = False
-    if previous:
-        previous_videos = db.query(Video).filter(
-            Video.analysis_id == previous.id,
-            Video.source == "own"
-        ).all()
-        if previous_videos:
-            has_previous = True
-            previous_avg_engagement = round(
-                avg_engagement(previous_videos), 4
-            )
-
-    # 5️⃣ Dashboard response
+    # 4️⃣ Dashboard response
     return {
         "analysis_id": analysis_id,
 
         "own": {
-            "total_videos": len(own_videos),
-            "avg_views": round(avg_views(own_videos), 2),
-            "avg_engagement": round(avg_engagement(own_videos), 4),
-            "videos": [
-                {
-                    "title": v.title,
-                    "engagement_rate": v.engagement_rate
-                }
-                for v in own_sorted
-            ],
-            "best_videos": [
-                {
-                    "title": v.title,
-                    "engagement_rate": v.engagement_rate
-                } for v in own_sorted[:3]
-            ],
-            "worst_videos": [
-                {
-                    "title": v.title,
-                    "engagement_rate": v.engagement_rate
-                } for v in own_sorted[-3:]
-            ],
+            "total_videos": summary.own_total_videos,
+            "avg_views": round(summary.own_avg_views, 2),
+            "avg_engagement": round(summary.own_avg_engagement, 4),
+            "engagement_percentiles": summary.own_engagement_percentiles,
+            "videos": summary.own_videos,
+            "best_videos": summary.own_best_videos,
+            "worst_videos": summary.own_worst_videos,
+            # None for summaries built before velocity was stored
+            "velocity": summary.own_velocity,
         },
 
         "competitors": {
-            "total_videos": len(competitor_videos),
-            "avg_views": round(avg_views(competitor_videos), 2),
-            "avg_engagement": round(avg_engagement(competitor_videos), 4),
+            "total_videos": summary.competitor_total_videos,
+            "avg_views": round(summary.competitor_avg_views, 2),
+            "avg_engagement": round(summary.competitor_avg_engagement, 4),
         },
 
         "comparison": {
             "engagement_gap": round(
-                avg_engagement(competitor_videos)
-                - avg_engagement(own_videos),
+                summary.competitor_avg_engagement
+                - summary.own_avg_engagement,
                 4
             )
         },
@@ -136,13 +126,11 @@ def get_dashboard_data(
             [
                 {
                     "label": "Previous",
-                    "engagement": previous_avg_engagement or 0
+                    "engagement": round(previous_avg_engagement, 4) or 0
                 },
                 {
                     "label": "Current",
-                    "engagement": round(
-                        avg_engagement(own_videos), 4
-                    )
+                    "engagement": round(summary.own_avg_engagement, 4)
                 }
             ] if has_previous else []
         )
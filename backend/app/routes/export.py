@@ -0,0 +1,51 @@
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+from app.database import get_db
+from app.models.analysis import AnalysisRun
+from app.dependencies.auth import get_current_user
+from app.services.video_export import ndjson_chunks, csv_chunks
+
+router = APIRouter(prefix="/analysis", tags=["export"])
+
+
+def _get_own_analysis(db: Session, analysis_id: int, user_id: int):
+    analysis = db.query(AnalysisRun.id).filter(
+        AnalysisRun.id == analysis_id,
+        AnalysisRun.user_id == user_id
+    ).first()
+    if not analysis:
+        raise HTTPException(status_code=404, detail="Analysis not found")
+    return analysis
+
+
+@router.get("/{analysis_id}/videos.ndjson")
+def export_videos_ndjson(
+    analysis_id: int,
+    db: Session = Depends(get_db),
+    current_user = Depends(get_current_user)
+):
+    """Every video of a run, streamed as newline-delimited JSON."""
+    _get_own_analysis(db, analysis_id, current_user.id)
+    return StreamingResponse(
+        ndjson_chunks(analysis_id),
+        media_type="application/x-ndjson"
+    )
+
+
+@router.get("/{analysis_id}/videos.csv")
+def export_videos_csv(
+    analysis_id: int,
+    db: Session = Depends(get_db),
+    current_user = Depends(get_current_user)
+):
+    """Every video of a run, streamed as CSV."""
+    _get_own_analysis(db, analysis_id, current_user.id)
+    return StreamingResponse(
+        csv_chunks(analysis_id),
+        media_type="text/csv",
+        headers={
+            "Content-Disposition":
+                f'attachment; filename="analysis-{analysis_id}-videos.csv"'
+        }
+    )
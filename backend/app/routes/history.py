@@ -1,19 +1,40 @@
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
-from app.database import get_db
-from app.models.analysis import AnalysisRun
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import get_async_db
 from app.dependencies.auth import get_current_user
+from app.services.analysis_history import (
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE,
+    InvalidCursor,
+    history_page,
+    with_archived
+)
 
 router = APIRouter(prefix="/history", tags=["history"])
 
 @router.get("/")
-def get_history(
-    db: Session = Depends(get_db),
+async def get_history(
+    cursor: str | None = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    include_archived: bool = False,
+    db: AsyncSession = Depends(get_async_db),
     current_user = Depends(get_current_user)
 ):
-    return (
-        db.query(AnalysisRun)
-        .filter(AnalysisRun.user_id == current_user.id)
-        .order_by(AnalysisRun.analyzed_at.desc())
-        .all()
-    )
+    try:
+        page = await db.run_sync(
+            history_page, current_user.id, cursor=cursor, limit=limit
+        )
+        if include_archived:
+            page = await run_in_threadpool(
+                with_archived, page, current_user.id,
+                cursor=cursor, limit=limit
+            )
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return {
+        "items": page["items"],
+        "has_more": page["has_more"],
+        "next_cursor": page["next_cursor"],
+    }
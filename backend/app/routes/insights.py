@@ -1,59 +1,42 @@
 from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.dependencies.auth import get_current_user
-from app.database import get_db
-from app.models.analysis import Video, AnalysisRun
-from app.models.user import User
-from app.youtube.youtube_fetch import fetch_trending_videos_by_query
+from app.database import get_async_db
+from app.models.analysis import AnalysisRun
+from app.services.trending_cache import trending_cache
+from app.services.topics import build_niche_query, find_topic_gaps
+from app.services.analysis_summary import (
+    get_summary,
+    previous_own_avg_engagement,
+    previous_run_id
+)
+from app.services.insights_cache import insights_cache
 
 router = APIRouter(prefix="/analysis", tags=["Insights"])
 
-STOPWORDS = {
-    "the", "a", "an", "and", "or", "of", "to", "in", "on", "for",
-    "with", "your", "you", "my", "our", "is", "are", "was", "were",
-    "how", "why", "what", "this", "that", "these", "those", "from",
-    "by", "at", "as", "it", "be", "will", "vs", "ft", "feat"
-}
-
-
-def extract_topics(videos, limit=8):
-    scores = {}
-    for v in videos:
-        title = (v.title or "").lower()
-        words = [
-            w.strip(".,!?()[]{}\"'").lower()
-            for w in title.split()
-        ]
-        for w in words:
-            if len(w) < 3 or w in STOPWORDS:
-                continue
-            scores[w] = scores.get(w, 0) + max(v.engagement_rate, 0)
-
-    ranked = sorted(
-        scores.items(), key=lambda x: x[1], reverse=True
-    )
-    return [w for w, _ in ranked[:limit]]
-
-
-def build_niche_query(competitor_topics, own_topics, limit=5):
-    pool = []
-    for t in competitor_topics + own_topics:
-        if t not in pool:
-            pool.append(t)
-        if len(pool) >= limit:
-            break
-    return " ".join(pool)
+
+@router.get("/insights/cache-stats")
+def get_insights_cache_stats(current_user = Depends(get_current_user)):
+    return insights_cache.stats()
+
 
 @router.get("/{analysis_id}/insights")
-def generate_insights(
+async def generate_insights(
     analysis_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user = Depends(get_current_user)
 ):
+    return await db.run_sync(
+        _insights, analysis_id, current_user.id, current_user.goal
+    )
+
+
+def _insights(db: Session, analysis_id: int, user_id: int, goal):
     current_analysis = db.query(AnalysisRun).filter(
         AnalysisRun.id == analysis_id,
-        AnalysisRun.user_id == current_user.id
+        AnalysisRun.user_id == user_id
     ).first()
 
     if not current_analysis:
@@ -61,46 +44,42 @@ def generate_insights(
             status_code=404,
             detail="Analysis not found"
         )
-    base_query = db.query(Video).join(AnalysisRun).filter(
-        Video.analysis_id == analysis_id,
-        AnalysisRun.user_id == current_user.id
+
+    # Output only depends on this run, the run before it and the goal
+    cache_key = (
+        analysis_id, previous_run_id(db, current_analysis), goal
     )
+    cached = insights_cache.get(cache_key)
+    if cached is not None:
+        return _with_trending(cached)
 
-    own_videos = base_query.filter(Video.source == "own").all()
-    competitor_videos = base_query.filter(
-        Video.source == "competitor"
-    ).all()
+    summary = get_summary(db, analysis_id)
 
-    if not own_videos:
+    if summary is None:
         raise HTTPException(
             status_code=404,
-            detail="No videos found for this analysis"
+            detail="Analysis is still running"
         )
 
-    total_videos = len(own_videos)
+    if not summary.own_total_videos:
+        raise HTTPException(
+            status_code=404,
+            detail="No videos found for this analysis"
+        )
 
-    avg_engagement = (
-        sum(v.engagement_rate for v in own_videos) / total_videos
+    total_videos = summary.own_total_videos
+    avg_engagement = summary.own_avg_engagement
+    high_performers = summary.own_high_performers
+    low_performers = summary.own_low_performers
+
+    # Bottom 3 never repeats a video that is already in the top 3
+    top_3 = summary.own_best_videos[:3]
+    remaining_for_bottom = total_videos - len(top_3)
+    bottom_3 = (
+        summary.own_worst_videos[-min(remaining_for_bottom, 3):]
+        if remaining_for_bottom > 0 else []
     )
 
-    high_performers = [
-        v for v in own_videos if v.engagement_rate > avg_engagement
-    ]
-
-    low_performers = [
-        v for v in own_videos if v.engagement_rate < avg_engagement * 0.6
-    ]
-
-    sorted_own = sorted(
-        own_videos, key=lambda x: x.engagement_rate, reverse=True
-    )
-
-    top_3 = sorted_own[:3]
-    remaining_for_bottom = [
-        v for v in sorted_own if v not in top_3
-    ]
-    bottom_3 = remaining_for_bottom[-3:] if remaining_for_bottom else []
-
     insights = []
 
     # 🔹 Insight 1: Engagement pattern
@@ -129,22 +108,20 @@ def generate_insights(
             "Focus on stronger hooks in the first 5 seconds of videos."
         )
 
-    if len(high_performers) >= 3:
+    if high_performers >= 3:
         recommendations.append(
             "Double down on topics similar to your top-performing videos."
         )
 
-    if len(low_performers) >= 2:
+    if low_performers >= 2:
         recommendations.append(
             "Rework or avoid content styles seen in low-performing videos."
         )
 
     # Competitor topic gaps + suggestions
-    competitor_topics = extract_topics(competitor_videos, limit=8)
-    own_topics = extract_topics(own_videos, limit=8)
-    topic_gaps = [
-        t for t in competitor_topics if t not in own_topics
-    ][:5]
+    competitor_topics = summary.competitor_topics or []
+    own_topics = summary.own_topics or []
+    topic_gaps = find_topic_gaps(competitor_topics, own_topics, limit=5)
 
     hashtag_suggestions = [
         f"#{t.replace(' ', '')}" for t in competitor_topics[:6]
@@ -161,26 +138,7 @@ def generate_insights(
     ]
 
     # Growth rating based on previous analysis
-    previous = (
-        db.query(AnalysisRun)
-        .filter(
-            AnalysisRun.user_id == current_user.id,
-            AnalysisRun.analyzed_at < current_analysis.analyzed_at
-        )
-        .order_by(AnalysisRun.analyzed_at.desc())
-        .first()
-    )
-
-    previous_avg = None
-    if previous:
-        prev_videos = db.query(Video).filter(
-            Video.analysis_id == previous.id,
-            Video.source == "own"
-        ).all()
-        if prev_videos:
-            previous_avg = sum(
-                v.engagement_rate for v in prev_videos
-            ) / len(prev_videos)
+    previous_avg = previous_own_avg_engagement(db, current_analysis)
 
     growth_delta = (
         round(avg_engagement - previous_avg, 4)
@@ -200,8 +158,6 @@ def generate_insights(
         growth_rating = "Needs improvement"
 
     # Goal-based tips
-    user = db.query(User).filter(User.id == current_user.id).first()
-    goal = user.goal if user else None
     goal_tips = []
 
     if goal == "Grow engagement":
@@ -222,24 +178,16 @@ def generate_insights(
             "Replicate formats from your top-performing topics."
         )
 
-    competitor_avg_engagement = (
-        sum(v.engagement_rate for v in competitor_videos) /
-        len(competitor_videos)
-        if competitor_videos else 0
-    )
+    competitor_avg_engagement = summary.competitor_avg_engagement
 
     niche_query = build_niche_query(
         competitor_topics, own_topics, limit=5
     )
-    trending_videos = fetch_trending_videos_by_query(
-        niche_query, max_results=6, region_code="US"
-    )
-
-    return {
+    response = {
         "analysis_id": analysis_id,
         "total_videos": total_videos,
         "average_engagement": round(avg_engagement, 4),
-        "competitor_total_videos": len(competitor_videos),
+        "competitor_total_videos": summary.competitor_total_videos,
         "competitor_average_engagement": round(
             competitor_avg_engagement, 4
         ),
@@ -255,22 +203,39 @@ def generate_insights(
         "goal_tips": goal_tips,
         "growth_delta": growth_delta,
         "growth_rating": growth_rating,
-        "trending_ideas": trending_videos,
         "niche_query": niche_query,
         "high_performing_videos": [
             {
-                "title": v.title,
-                "engagement_rate": round(v.engagement_rate, 4)
+                "title": v["title"],
+                "engagement_rate": round(v["engagement_rate"], 4)
             }
             for v in top_3
         ],
         "low_performing_videos": [
             {
-                "title": v.title,
-                "engagement_rate": round(v.engagement_rate, 4)
+                "title": v["title"],
+                "engagement_rate": round(v["engagement_rate"], 4)
             }
             for v in bottom_3
         ],
         "insights": insights,
         "recommendations": recommendations
     }
+
+    # Trending ideas are not part of the cached response: they have
+    # their own TTL and refresher in trending_cache
+    insights_cache.put(cache_key, user_id, response)
+
+    return _with_trending(response)
+
+
+def _with_trending(response: dict) -> dict:
+    # Served from cache only; misses are fetched in the background
+    trending_videos = trending_cache.get(
+        response["niche_query"], region_code="US"
+    )
+    return {
+        **response,
+        "trending_ideas": trending_videos or [],
+        "trending_pending": trending_videos is None,
+    }
@@ -5,6 +5,8 @@ from pydantic import BaseModel
 from app.database import get_db
 from app.dependencies.auth import get_current_user
 from app.models.user import User
+from app.services.insights_cache import insights_cache
+from app.services.user_cache import current_user_cache
 
 router = APIRouter(prefix="/onboarding", tags=["onboarding"])
 
@@ -20,13 +22,18 @@ def complete_onboarding(
     db: Session = Depends(get_db),
     current_user = Depends(get_current_user)
 ):
-    user = db.query(User).filter(User.id == current_user.id).first()
-    if not user:
+    updated = db.query(User).filter(User.id == current_user.id).update(
+        {
+            "role": data.role,
+            "goal": data.goal,
+            "onboarding_complete": True,
+        },
+        synchronize_session=False
+    )
+    if not updated:
         raise HTTPException(status_code=404, detail="User not found")
-
-    user.role = data.role
-    user.goal = data.goal
-    user.onboarding_complete = True
     db.commit()
+    current_user_cache.invalidate_user(current_user.id)
+    insights_cache.invalidate_user(current_user.id)
 
     return {"message": "Onboarding completed"}
@@ -5,6 +5,8 @@ from sqlalchemy.orm import Session
 from app.database import get_db
 from app.dependencies.auth import get_current_user
 from app.models.user import User
+from app.services.insights_cache import insights_cache
+from app.services.user_cache import current_user_cache
 
 router = APIRouter(prefix="/users", tags=["users"])
 
@@ -18,15 +20,7 @@ class UserUpdateRequest(BaseModel):
     competitor_alerts_enabled: bool | None = None
 
 
-@router.get("/me")
-def get_me(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
-):
-    user = db.query(User).filter(User.id == current_user.id).first()
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
-
+def _user_fields(user) -> dict:
     return {
         "id": user.id,
         "name": user.name,
@@ -38,41 +32,45 @@ def get_me(
     }
 
 
+@router.get("/me")
+async def get_me(current_user: User = Depends(get_current_user)):
+    return _user_fields(current_user)
+
+
 @router.put("/me")
 def update_me(
     data: UserUpdateRequest,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    user = db.query(User).filter(User.id == current_user.id).first()
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
+    changes = {
+        field: value
+        for field, value in (
+            ("name", data.name),
+            ("email", data.email),
+            ("role", data.role),
+            ("goal", data.goal),
+            ("weekly_summary_enabled", data.weekly_summary_enabled),
+            ("competitor_alerts_enabled", data.competitor_alerts_enabled),
+        )
+        if value is not None
+    }
 
-    if data.name is not None:
-        user.name = data.name
-    if data.email is not None:
-        user.email = data.email
-    if data.role is not None:
-        user.role = data.role
-    if data.goal is not None:
-        user.goal = data.goal
-    if data.weekly_summary_enabled is not None:
-        user.weekly_summary_enabled = data.weekly_summary_enabled
-    if data.competitor_alerts_enabled is not None:
-        user.competitor_alerts_enabled = data.competitor_alerts_enabled
+    # The user was just loaded by get_current_user: update in place
+    # instead of selecting the row again
+    if changes:
+        updated = db.query(User).filter(User.id == current_user.id).update(
+            changes, synchronize_session=False
+        )
+        if not updated:
+            raise HTTPException(status_code=404, detail="User not found")
+        db.commit()
 
-    db.commit()
-    db.refresh(user)
+    current_user_cache.invalidate_user(current_user.id)
+    if changes.get("goal", current_user.goal) != current_user.goal:
+        insights_cache.invalidate_user(current_user.id)
 
     return {
         "message": "Settings updated",
-        "user": {
-            "id": user.id,
-            "name": user.name,
-            "email": user.email,
-            "role": user.role,
-            "goal": user.goal,
-            "weekly_summary_enabled": user.weekly_summary_enabled,
-            "competitor_alerts_enabled": user.competitor_alerts_enabled,
-        }
+        "user": {**_user_fields(current_user), **changes}
     }
@@ -0,0 +1,119 @@
+import base64
+from datetime import datetime
+
+from sqlalchemy import or_
+from sqlalchemy.orm import Session
+
+from app.models.analysis import AnalysisRun
+from app.services.run_archive import archived_runs
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(analyzed_at: datetime, analysis_id: int) -> str:
+    raw = f"{analyzed_at.isoformat()}|{analysis_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor: str):
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode()).decode()
+        analyzed_at, analysis_id = raw.split("|")
+        return datetime.fromisoformat(analyzed_at), int(analysis_id)
+    except (ValueError, UnicodeDecodeError):
+        raise InvalidCursor("Invalid cursor")
+
+
+def history_page(
+    db: Session,
+    user_id: int,
+    cursor: str | None = None,
+    limit: int = DEFAULT_PAGE_SIZE
+) -> dict:
+    """
+    One page of a user's runs, newest first, keyset-paginated on
+    (analyzed_at, id). Only the listed columns are loaded, and the
+    page is a range seek on ix_analysis_runs_user_analyzed (whose
+    entries end in the rowid), so its cost does not grow with the
+    number of runs. has_more comes from fetching one extra row.
+    """
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+
+    query = db.query(
+        AnalysisRun.id, AnalysisRun.channel_url, AnalysisRun.analyzed_at
+    ).filter(AnalysisRun.user_id == user_id)
+
+    if cursor:
+        analyzed_at, analysis_id = decode_cursor(cursor)
+        query = query.filter(
+            AnalysisRun.analyzed_at <= analyzed_at,
+            or_(
+                AnalysisRun.analyzed_at < analyzed_at,
+                AnalysisRun.id < analysis_id
+            )
+        )
+
+    rows = (
+        query.order_by(AnalysisRun.analyzed_at.desc(), AnalysisRun.id.desc())
+        .limit(limit + 1)
+        .all()
+    )
+    items = [
+        {
+            "id": row.id,
+            "channel_url": row.channel_url,
+            "analyzed_at": row.analyzed_at,
+            "archived": False,
+        }
+        for row in rows
+    ]
+    return _page(items, limit)
+
+
+def _page(items: list, limit: int) -> dict:
+    has_more = len(items) > limit
+    items = items[:limit]
+    return {
+        "items": items,
+        "has_more": has_more,
+        "next_cursor": (
+            encode_cursor(items[-1]["analyzed_at"], items[-1]["id"])
+            if has_more else None
+        ),
+    }
+
+
+def with_archived(
+    page: dict,
+    user_id: int,
+    cursor: str | None = None,
+    limit: int = DEFAULT_PAGE_SIZE
+) -> dict:
+    """
+    Tops up a history_page result with archived runs. They are all
+    older than the live ones, so they continue right after the last
+    live page with the same cursor format. Reads Parquet files: call
+    it off the event loop.
+    """
+    if page["has_more"]:
+        return page
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+
+    before = decode_cursor(cursor) if cursor and not page["items"] else None
+    archived = [
+        {
+            "id": run["analysis_id"],
+            "channel_url": run["channel_url"],
+            "analyzed_at": run["analyzed_at"],
+            "archived": True,
+        }
+        for run in archived_runs(
+            user_id, before=before, limit=limit + 1 - len(page["items"])
+        )
+    ]
+    return _page(page["items"] + archived, limit)
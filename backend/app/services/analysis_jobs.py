@@ -0,0 +1,301 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy.orm import Session
+
+from app.config import ANALYSIS_JOB_WORKERS
+from app.database import SessionLocal
+from app.models.analysis import (
+    AnalysisJob,
+    AnalysisRun,
+    AnalysisSummary,
+    TitleTerm,
+    Video
+)
+from app.services.incremental_analysis import refresh_run
+from app.services.ingestion import ingest_run
+from app.services.analysis_summary import get_summary
+from app.services.topics import build_niche_query
+from app.services.trending_cache import trending_cache
+from app.youtube.quota import quota_context, INTERACTIVE
+from app.youtube.youtube_fetch import (
+    fetch_channels_concurrently,
+    list_channels_concurrently
+)
+
+_executor = ThreadPoolExecutor(
+    max_workers=ANALYSIS_JOB_WORKERS, thread_name_prefix="analysis-job"
+)
+
+# A running job touches updated_at every HEARTBEAT_INTERVAL seconds; one
+# that has not done so for JOB_LEASE is assumed dead and may be requeued.
+HEARTBEAT_INTERVAL = 30
+JOB_LEASE = timedelta(minutes=5)
+
+
+class AnalysisFailed(Exception):
+    def __init__(self, message: str, retry_at=None):
+        self.retry_at = retry_at
+        super().__init__(message)
+
+
+def _retry_at(error):
+    """Naive UTC retry time of a quota failure, else None."""
+    retry_at = getattr(error, "retry_at", None)
+    if retry_at is None:
+        return None
+    return retry_at.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def _check_own_channel(result):
+    if result["quota_error"]:
+        raise AnalysisFailed(
+            str(result["quota_error"]),
+            retry_at=result["quota_error"].retry_at
+        )
+    if result["error"]:
+        raise AnalysisFailed(
+            f"Could not fetch channel videos: {result['error']}"
+        )
+
+
+def _set_progress(db: Session, job: AnalysisJob, progress: int):
+    job.progress = progress
+    job.updated_at = datetime.utcnow()
+    db.commit()
+
+
+def _run_incremental(db, job, analysis, channel_requests):
+    with quota_context(job.user_id, INTERACTIVE):
+        listings = list_channels_concurrently(channel_requests)
+    _check_own_channel(listings[0])
+    _set_progress(db, job, 50)
+
+    refresh = refresh_run(
+        db, analysis, listings[0]["video_ids"], listings[1:]
+    )
+    return {
+        "incremental": True,
+        "total_videos": len(listings[0]["video_ids"]),
+        "competitor_channels": len(listings) - 1,
+        "competitor_videos": sum(
+            len(listing["video_ids"]) for listing in listings[1:]
+        ),
+        **refresh
+    }
+
+
+def _run_full(db, job, analysis, channel_requests):
+    # Own channel + all competitors are fetched in parallel
+    with quota_context(job.user_id, INTERACTIVE):
+        fetch_results = fetch_channels_concurrently(channel_requests)
+    own_result, competitor_results = fetch_results[0], fetch_results[1:]
+    _check_own_channel(own_result)
+    _set_progress(db, job, 60)
+
+    competitor_videos = []
+    failed_competitors = []
+    for result in competitor_results:
+        if result["error"]:
+            failed_competitors.append({
+                "channel_url": result["channel_url"],
+                "error": result["error"]
+            })
+            continue
+        competitor_videos.extend(result["videos"])
+
+    ingest = ingest_run(
+        db, analysis, own_result["videos"], competitor_videos
+    )
+
+    return {
+        "total_videos": len(own_result["videos"]),
+        "competitor_channels": len(competitor_results),
+        "competitor_videos": len(competitor_videos),
+        "failed_competitors": failed_competitors,
+        "ingest": ingest
+    }
+
+
+def _discard_run(db: Session, job: AnalysisJob, analysis: AnalysisRun):
+    """
+    Deletes a brand-new run that never got videos, together with every
+    row that references it. The job keeps its error but no longer
+    points at the run.
+    """
+    job.analysis_id = None
+    for column in (
+        Video.analysis_id,
+        TitleTerm.analysis_id,
+        AnalysisSummary.analysis_id
+    ):
+        db.query(column.class_).filter(column == analysis.id).delete(
+            synchronize_session=False
+        )
+    db.flush()
+    db.delete(analysis)
+
+
+def _mark_failed(db: Session, job_id: int, error: str):
+    db.query(AnalysisJob).filter(AnalysisJob.id == job_id).update(
+        {
+            "status": "failed",
+            "error": error,
+            "progress": 100,
+            "updated_at": datetime.utcnow(),
+        },
+        synchronize_session=False
+    )
+    db.commit()
+
+
+def _claim(db: Session, job_id: int) -> bool:
+    """
+    queued -> running in one conditional UPDATE, so a job submitted by
+    several workers (or requeued twice) only runs once.
+    """
+    claimed = db.query(AnalysisJob).filter(
+        AnalysisJob.id == job_id,
+        AnalysisJob.status == "queued"
+    ).update(
+        {"status": "running", "updated_at": datetime.utcnow()},
+        synchronize_session=False
+    )
+    db.commit()
+    return claimed == 1
+
+
+def _heartbeat(job_id: int, stop: threading.Event):
+    while not stop.wait(HEARTBEAT_INTERVAL):
+        db = SessionLocal()
+        try:
+            db.query(AnalysisJob).filter(
+                AnalysisJob.id == job_id,
+                AnalysisJob.status == "running"
+            ).update(
+                {"updated_at": datetime.utcnow()},
+                synchronize_session=False
+            )
+            db.commit()
+        except Exception as e:
+            print("Job heartbeat failed:", e)
+        finally:
+            db.close()
+
+
+def run_job(job_id: int):
+    db = SessionLocal()
+    try:
+        if not _claim(db, job_id):
+            return
+    finally:
+        db.close()
+
+    stop = threading.Event()
+    threading.Thread(
+        target=_heartbeat, args=(job_id, stop),
+        name=f"job-heartbeat-{job_id}", daemon=True
+    ).start()
+
+    db = SessionLocal()
+    try:
+        _run_job(db, job_id)
+    except Exception as e:
+        # Whatever went wrong, the job must not stay "running"
+        print("Analysis job failed:", e)
+        db.rollback()
+        try:
+            _mark_failed(db, job_id, str(e))
+        except Exception as mark_error:
+            print("Could not record job failure:", mark_error)
+    finally:
+        stop.set()
+        db.close()
+
+
+def _run_job(db: Session, job_id: int):
+    job = db.query(AnalysisJob).filter(AnalysisJob.id == job_id).first()
+
+    analysis = db.query(AnalysisRun).filter(
+        AnalysisRun.id == job.analysis_id
+    ).first()
+    if analysis is None:
+        job.status = "failed"
+        job.error = "Analysis not found"
+        _set_progress(db, job, 100)
+        return
+
+    _set_progress(db, job, 10)
+
+    params = job.params
+    channel_requests = (
+        [(params["channel_url"], params["own_max_results"])]
+        + [
+            (url, params["competitor_max_results"])
+            for url in params["competitor_urls"]
+        ]
+    )
+
+    try:
+        if params.get("incremental"):
+            result = _run_incremental(db, job, analysis, channel_requests)
+        else:
+            result = _run_full(db, job, analysis, channel_requests)
+    except Exception as e:
+        db.rollback()
+        job.status = "failed"
+        job.error = str(e)
+        job.retry_at = _retry_at(e)
+        # A brand-new run that never got videos would only be an
+        # empty entry in the user's history
+        if not params.get("incremental"):
+            _discard_run(db, job, analysis)
+        _set_progress(db, job, 100)
+        if not isinstance(e, AnalysisFailed):
+            print("Analysis job failed:", e)
+        return
+
+    job.status = "done"
+    job.result = result
+    _set_progress(db, job, 100)
+
+    # Have trending ideas ready before the insights page asks
+    try:
+        summary = get_summary(db, analysis.id)
+        trending_cache.schedule_refresh(
+            build_niche_query(
+                summary.competitor_topics or [], summary.own_topics or []
+            ),
+            "US"
+        )
+    except Exception as e:
+        print("Could not warm trending cache:", e)
+
+
+def submit_job(job_id: int):
+    _executor.submit(run_job, job_id)
+
+
+def resume_pending_jobs():
+    """
+    Requeues jobs that were queued when the app stopped and running jobs
+    whose lease ran out. Safe to run in every worker: each job is only
+    claimed by one of them.
+    """
+    db = SessionLocal()
+    try:
+        db.query(AnalysisJob).filter(
+            AnalysisJob.status == "running",
+            AnalysisJob.updated_at < datetime.utcnow() - JOB_LEASE
+        ).update({"status": "queued"}, synchronize_session=False)
+        db.commit()
+
+        pending = db.query(AnalysisJob.id).filter(
+            AnalysisJob.status == "queued"
+        ).order_by(AnalysisJob.created_at).all()
+    finally:
+        db.close()
+
+    for (job_id,) in pending:
+        submit_job(job_id)
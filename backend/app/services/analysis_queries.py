@@ -0,0 +1,37 @@
+"""
+SQL fallbacks for runs ingested before the summary table existed.
+
+Per-source aggregates and best / worst videos are no longer queried
+here: build_summary computes them with video_stats at ingest and the
+routes read the materialized AnalysisSummary row.
+"""
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.models.analysis import AnalysisRun, Video
+
+
+def previous_avg_engagement(db: Session, analysis: AnalysisRun):
+    """
+    Avg own engagement of the user's run before `analysis`, or None.
+    The previous run is picked in a subquery, so this is one query.
+    """
+    previous_id = (
+        db.query(AnalysisRun.id)
+        .filter(
+            AnalysisRun.user_id == analysis.user_id,
+            AnalysisRun.analyzed_at < analysis.analyzed_at
+        )
+        .order_by(AnalysisRun.analyzed_at.desc())
+        .limit(1)
+        .scalar_subquery()
+    )
+
+    return (
+        db.query(func.avg(Video.engagement_rate))
+        .filter(
+            Video.analysis_id == previous_id,
+            Video.source == "own"
+        )
+        .scalar()
+    )
@@ -0,0 +1,202 @@
+from datetime import datetime
+
+from sqlalchemy import case, func
+from sqlalchemy.orm import Session
+
+from app.models.analysis import (
+    AnalysisJob,
+    AnalysisRun,
+    AnalysisSummary,
+    Video
+)
+from app.services.analysis_queries import previous_avg_engagement
+from app.services.title_terms import build_title_terms, top_terms
+from app.services.video_snapshots import own_velocity
+from app.services.video_stats import (
+    load_video_columns,
+    engagement_stats,
+    select,
+    ranked
+)
+
+TOPIC_LIMIT = 8
+
+
+def build_summary(db: Session, analysis_id: int) -> AnalysisSummary:
+    """
+    (Re)computes the title-term index and summary row of a run from
+    its videos.
+    Does not commit: callers write it in the same transaction as the
+    videos it was computed from.
+    """
+    build_title_terms(db, analysis_id)
+
+    columns = load_video_columns(db, analysis_id)
+    overall = engagement_stats(columns, k=2)
+    own_columns = select(columns, columns["source"] == "own")
+    own = engagement_stats(own_columns, k=3)
+    competitor = engagement_stats(
+        select(columns, columns["source"] == "competitor")
+    )
+
+    summary = AnalysisSummary(
+        analysis_id=analysis_id,
+
+        total_videos=overall["total_videos"],
+        avg_views=overall["avg_views"],
+        avg_engagement=overall["avg_engagement"],
+        top_videos=overall["top"][:2],
+        low_videos=overall["bottom"][-1:],
+
+        own_total_videos=own["total_videos"],
+        own_avg_views=own["avg_views"],
+        own_avg_engagement=own["avg_engagement"],
+        own_engagement_percentiles=own["percentiles"],
+        own_high_performers=int(own["high_mask"].sum()),
+        own_low_performers=int(own["low_mask"].sum()),
+        own_videos=ranked(own_columns),
+        own_best_videos=own["top"],
+        own_worst_videos=own["bottom"],
+        own_topics=top_terms(db, analysis_id, "own", TOPIC_LIMIT),
+        own_velocity=own_velocity(db, analysis_id),
+
+        competitor_total_videos=competitor["total_videos"],
+        competitor_avg_views=competitor["avg_views"],
+        competitor_avg_engagement=competitor["avg_engagement"],
+        competitor_topics=top_terms(
+            db, analysis_id, "competitor", TOPIC_LIMIT
+        ),
+
+        updated_at=datetime.utcnow()
+    )
+    return db.merge(summary)
+
+
+def get_summary(db: Session, analysis_id: int):
+    """
+    Reads the summary row, building it once for runs ingested before.
+    Returns None while the run has no summary and a job is still
+    queued or running on it: that job writes the summary itself.
+    """
+    summary = db.query(AnalysisSummary).filter(
+        AnalysisSummary.analysis_id == analysis_id
+    ).first()
+
+    if summary is None:
+        pending = db.query(AnalysisJob.id).filter(
+            AnalysisJob.analysis_id == analysis_id,
+            AnalysisJob.status.in_(["queued", "running"])
+        ).first()
+        if pending:
+            return None
+
+        summary = build_summary(db, analysis_id)
+        db.commit()
+
+    return summary
+
+
+def _previous_run_id_query(db: Session, analysis: AnalysisRun):
+    return (
+        db.query(AnalysisRun.id)
+        .filter(
+            AnalysisRun.user_id == analysis.user_id,
+            AnalysisRun.analyzed_at < analysis.analyzed_at
+        )
+        .order_by(AnalysisRun.analyzed_at.desc())
+        .limit(1)
+    )
+
+
+def previous_run_id(db: Session, analysis: AnalysisRun):
+    return _previous_run_id_query(db, analysis).scalar()
+
+
+def previous_own_avg_engagement(db: Session, analysis: AnalysisRun):
+    """
+    Avg own engagement of the user's run before `analysis`, or None,
+    read from that run's summary when it has one.
+    """
+    previous_id = _previous_run_id_query(db, analysis).scalar_subquery()
+
+    row = db.query(
+        AnalysisSummary.own_total_videos,
+        AnalysisSummary.own_avg_engagement
+    ).filter(AnalysisSummary.analysis_id == previous_id).first()
+
+    if row is None:
+        return previous_avg_engagement(db, analysis)
+    own_total, own_avg = row
+    return own_avg if own_total else None
+
+
+def engagement_trend_query(db: Session, user_id: int, start=None, end=None):
+    """
+    (analysis_id, analyzed_at, avg own engagement) of every run of the
+    user, oldest first. The value comes from the summary rollup and
+    falls back to averaging the videos for runs that don't have a
+    summary row yet.
+    """
+    video_avg = (
+        db.query(func.avg(Video.engagement_rate))
+        .filter(
+            Video.analysis_id == AnalysisRun.id,
+            Video.source == "own"
+        )
+        .correlate(AnalysisRun)
+        .scalar_subquery()
+    )
+    engagement = case(
+        (
+            AnalysisSummary.analysis_id.is_(None),
+            video_avg
+        ),
+        (
+            AnalysisSummary.own_total_videos > 0,
+            AnalysisSummary.own_avg_engagement
+        ),
+        else_=None
+    )
+
+    query = (
+        db.query(AnalysisRun.id, AnalysisRun.analyzed_at, engagement)
+        .outerjoin(
+            AnalysisSummary,
+            AnalysisSummary.analysis_id == AnalysisRun.id
+        )
+        .filter(AnalysisRun.user_id == user_id)
+    )
+    if start is not None:
+        query = query.filter(AnalysisRun.analyzed_at >= start)
+    if end is not None:
+        query = query.filter(AnalysisRun.analyzed_at <= end)
+
+    return query.order_by(AnalysisRun.analyzed_at)
+
+
+def engagement_trend(db: Session, user_id: int, start=None, end=None):
+    """Rows of engagement_trend_query, minus runs without own videos."""
+    rows = engagement_trend_query(db, user_id, start=start, end=end).all()
+    return [row for row in rows if row[2] is not None]
+
+
+def downsample(points: list, max_points: int) -> list:
+    """
+    Averages consecutive points into at most max_points buckets.
+    Each point is (analysis_id, analyzed_at, engagement); a bucket keeps
+    the id and time of its last run.
+    """
+    if max_points <= 0 or len(points) <= max_points:
+        return points
+
+    buckets = []
+    size = len(points) / max_points
+    for i in range(max_points):
+        chunk = points[round(i * size):round((i + 1) * size)]
+        if chunk:
+            buckets.append((
+                chunk[-1][0],
+                chunk[-1][1],
+                sum(p[2] for p in chunk) / len(chunk)
+            ))
+    return buckets
@@ -0,0 +1,141 @@
+from datetime import datetime
+
+from sqlalchemy.orm import Session
+
+from app.models.analysis import AnalysisRun, Video
+from app.services.ingestion import insert_video_rows
+from app.services.analysis_summary import build_summary
+from app.services.insights_cache import insights_cache
+from app.services.video_snapshots import record_snapshots
+from app.youtube.youtube_fetch import VideoStatsBatch, build_video
+
+# Newest uploads per channel whose stats are re-fetched on every refresh.
+# Older videos barely move, so their stored numbers are carried forward.
+REFRESH_RECENT_VIDEOS = 10
+
+
+def find_previous_run(db: Session, user_id: int, channel_url: str):
+    return (
+        db.query(AnalysisRun)
+        .filter(
+            AnalysisRun.user_id == user_id,
+            AnalysisRun.channel_url == channel_url
+        )
+        .order_by(AnalysisRun.analyzed_at.desc())
+        .first()
+    )
+
+
+def _video_fields(video: dict) -> dict:
+    return {
+        "title": video["title"],
+        "views": video["views"],
+        "likes": video["likes"],
+        "comments": video["comments"],
+        "engagement_rate": video["engagement_rate"],
+    }
+
+
+def refresh_run(
+    db: Session,
+    analysis: AnalysisRun,
+    own_video_ids: list,
+    competitor_listings: list
+):
+    """
+    Brings an existing run up to date in place.
+
+    own_video_ids is the current upload listing of the own channel and
+    competitor_listings the results of list_channels_concurrently for the
+    competitors. Only new videos and the newest REFRESH_RECENT_VIDEOS of
+    each channel are looked up; new ones are inserted, recent ones
+    updated, videos that dropped out of the listing are removed and
+    everything else is left untouched.
+    """
+    wanted = {"own": own_video_ids, "competitor": []}
+    recent = set(own_video_ids[:REFRESH_RECENT_VIDEOS])
+    failed_competitors = []
+
+    for listing in competitor_listings:
+        if listing["error"]:
+            failed_competitors.append({
+                "channel_url": listing["channel_url"],
+                "error": listing["error"]
+            })
+            continue
+        wanted["competitor"].extend(listing["video_ids"])
+        recent.update(listing["video_ids"][:REFRESH_RECENT_VIDEOS])
+
+    # Only ids are needed to decide what changed, not whole rows
+    existing = {
+        (source, video_id): row_id
+        for row_id, source, video_id in db.query(
+            Video.id, Video.source, Video.video_id
+        ).filter(Video.analysis_id == analysis.id)
+    }
+
+    batch = VideoStatsBatch()
+    for source, video_ids in wanted.items():
+        batch.add(
+            video_id for video_id in video_ids
+            if video_id in recent or (source, video_id) not in existing
+        )
+    items = batch.fetch() if len(batch) else {}
+    fetched = {
+        video_id: build_video(item) for video_id, item in items.items()
+    }
+
+    inserts = []
+    updates = []
+    for source, video_ids in wanted.items():
+        for video_id in video_ids:
+            if video_id not in fetched:
+                continue
+            fields = _video_fields(fetched[video_id])
+            row_id = existing.get((source, video_id))
+            if row_id is None:
+                inserts.append({
+                    "analysis_id": analysis.id,
+                    "video_id": video_id,
+                    "source": source,
+                    **fields
+                })
+            else:
+                updates.append({"id": row_id, **fields})
+
+    # A competitor that failed to list keeps its old rows
+    removable_sources = ["own"] if failed_competitors else ["own", "competitor"]
+    wanted_sets = {source: set(ids) for source, ids in wanted.items()}
+    removed_ids = [
+        row_id
+        for (source, video_id), row_id in existing.items()
+        if source in removable_sources
+        and video_id not in wanted_sets[source]
+    ]
+
+    insert_video_rows(db, inserts)
+    if updates:
+        db.bulk_update_mappings(Video, updates)
+    if removed_ids:
+        db.query(Video).filter(Video.id.in_(removed_ids)).delete(
+            synchronize_session=False
+        )
+
+    snapshots = record_snapshots(db, list(fetched.values()))
+
+    analysis.analyzed_at = datetime.utcnow()
+    if inserts or updates or removed_ids:
+        build_summary(db, analysis.id)
+    db.commit()
+    # analyzed_at moved too, but runs whose "previous" run changed
+    # miss on their own: it is part of the cache key
+    insights_cache.invalidate_analysis(analysis.id)
+
+    return {
+        "new_videos": len(inserts),
+        "refreshed_videos": len(updates),
+        "removed_videos": len(removed_ids),
+        "snapshots": snapshots,
+        "unchanged_videos": len(existing) - len(updates) - len(removed_ids),
+        "failed_competitors": failed_competitors,
+    }
@@ -0,0 +1,76 @@
+import logging
+import time
+
+from sqlalchemy.orm import Session
+
+from app.models.analysis import AnalysisRun, Video
+from app.services.analysis_summary import build_summary
+from app.services.insights_cache import insights_cache
+from app.services.video_snapshots import record_snapshots
+
+logger = logging.getLogger(__name__)
+
+
+def video_rows(analysis_id: int, videos: list, source: str) -> list:
+    return [
+        {
+            "analysis_id": analysis_id,
+            "video_id": v["video_id"],
+            "title": v["title"],
+            "views": v["views"],
+            "likes": v["likes"],
+            "comments": v["comments"],
+            "engagement_rate": v["engagement_rate"],
+            "source": source,
+        }
+        for v in videos
+    ]
+
+
+def insert_video_rows(db: Session, rows: list):
+    """One executemany INSERT instead of an ORM object per video."""
+    if rows:
+        db.execute(Video.__table__.insert(), rows)
+
+
+def ingest_run(
+    db: Session,
+    analysis: AnalysisRun,
+    own_videos: list,
+    competitor_videos: list
+):
+    """
+    Writes the run, all of its videos and its summary row in a single
+    transaction.
+    Returns throughput stats for the write.
+    """
+    start = time.perf_counter()
+
+    if analysis.id is None:
+        db.add(analysis)
+        db.flush()  # assigns analysis.id without committing
+
+    rows = (
+        video_rows(analysis.id, own_videos, "own")
+        + video_rows(analysis.id, competitor_videos, "competitor")
+    )
+    insert_video_rows(db, rows)
+    snapshots = record_snapshots(db, own_videos + competitor_videos)
+    build_summary(db, analysis.id)
+    db.commit()
+    # Runs whose "previous" run changed miss on their own: it is part
+    # of the cache key
+    insights_cache.invalidate_analysis(analysis.id)
+
+    elapsed = time.perf_counter() - start
+    stats = {
+        "rows": len(rows),
+        "snapshots": snapshots,
+        "seconds": round(elapsed, 4),
+        "rows_per_sec": round(len(rows) / elapsed, 1) if elapsed else None,
+    }
+    logger.info(
+        "Ingested analysis %s: %s rows in %.3fs (%s rows/sec)",
+        analysis.id, stats["rows"], elapsed, stats["rows_per_sec"]
+    )
+    return stats
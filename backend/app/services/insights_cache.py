@@ -0,0 +1,68 @@
+import threading
+from collections import OrderedDict
+
+MAX_ENTRIES = 2000
+
+
+class InsightsCache:
+    """
+    LRU cache of generate_insights responses keyed by
+    (analysis_id, previous_run_id, goal).
+
+    Entries are dropped when the analysis' videos change (ingest,
+    refresh, archiving) or the user's goal changes, and the least
+    recently used ones once MAX_ENTRIES is reached. A run whose
+    previous run changes simply gets a new key.
+    Responses are cached without trending ideas, which callers merge in
+    from trending_cache on every read.
+    """
+
+    def __init__(self, max_entries: int = MAX_ENTRIES):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()  # key -> (user_id, response)
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key, user_id: int, response: dict):
+        with self._lock:
+            self._entries[key] = (user_id, response)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate_analysis(self, analysis_id: int):
+        with self._lock:
+            for key in [k for k in self._entries if k[0] == analysis_id]:
+                del self._entries[key]
+
+    def invalidate_user(self, user_id: int):
+        with self._lock:
+            for key in [
+                k for k, (owner, _) in self._entries.items()
+                if owner == user_id
+            ]:
+                del self._entries[key]
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else None,
+            }
+
+
+insights_cache = InsightsCache()
@@ -0,0 +1,338 @@
+"""
+Cold storage for old analysis runs.
+
+Runs older than ARCHIVE_AFTER_DAYS, except each user's latest
+ARCHIVE_KEEP_LATEST, are written to compressed Parquet datasets under
+ARCHIVE_PATH and deleted from the database:
+
+- runs/user_id=<id>/month=<YYYY-MM>/*.parquet: run + own engagement rollup
+- videos/user_id=<id>/month=<YYYY-MM>/*.parquet: every video of those runs
+
+Every archived run is older than every run left in the database, so
+history and trend reads can simply append archived runs after live ones.
+
+Archiving is off by default (ARCHIVE_AFTER_DAYS=0) and never runs inside
+the API workers; schedule one runner, e.g. a daily cron job:
+    python -m app.services.run_archive
+"""
+import argparse
+import logging
+import os
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.config import (
+    ARCHIVE_PATH,
+    ARCHIVE_AFTER_DAYS,
+    ARCHIVE_KEEP_LATEST,
+    ARCHIVE_COMPRESSION
+)
+from app.database import Base, SessionLocal, engine
+from app.migrations import run_migrations
+from app.models.analysis import (
+    AnalysisJob,
+    AnalysisRun,
+    AnalysisSummary,
+    TitleTerm,
+    Video
+)
+from app.services.insights_cache import insights_cache
+
+logger = logging.getLogger(__name__)
+
+BATCH_RUNS = 50
+
+PARTITIONING = ds.partitioning(
+    pa.schema([("user_id", pa.int64()), ("month", pa.string())]),
+    flavor="hive"
+)
+RUN_SCHEMA = pa.schema([
+    ("analysis_id", pa.int64()),
+    ("user_id", pa.int64()),
+    ("month", pa.string()),
+    ("channel_url", pa.string()),
+    ("analyzed_at", pa.timestamp("us")),
+    ("own_total_videos", pa.int64()),
+    ("own_avg_engagement", pa.float64()),
+])
+VIDEO_SCHEMA = pa.schema([
+    ("analysis_id", pa.int64()),
+    ("user_id", pa.int64()),
+    ("month", pa.string()),
+    ("video_id", pa.string()),
+    ("source", pa.string()),
+    ("title", pa.string()),
+    ("views", pa.int64()),
+    ("likes", pa.int64()),
+    ("comments", pa.int64()),
+    ("engagement_rate", pa.float64()),
+])
+
+
+def _dataset_path(name: str) -> str:
+    return os.path.join(ARCHIVE_PATH, name)
+
+
+def _write(name: str, rows: list, schema: pa.Schema):
+    if not rows:
+        return
+    pq.write_to_dataset(
+        pa.Table.from_pylist(rows, schema=schema),
+        root_path=_dataset_path(name),
+        partitioning=PARTITIONING,
+        basename_template=f"part-{uuid.uuid4().hex}-{{i}}.parquet",
+        existing_data_behavior="overwrite_or_ignore",
+        compression=ARCHIVE_COMPRESSION
+    )
+
+
+def _runs_to_archive(db: Session, cutoff: datetime, keep_latest: int):
+    """Ids of runs past the cutoff that are not among their user's latest."""
+    rank = func.row_number().over(
+        partition_by=AnalysisRun.user_id,
+        order_by=(AnalysisRun.analyzed_at.desc(), AnalysisRun.id.desc())
+    ).label("rank")
+    ranked = (
+        db.query(AnalysisRun.id, AnalysisRun.analyzed_at, rank)
+        .filter(AnalysisRun.user_id.isnot(None))
+        .subquery()
+    )
+    busy = db.query(AnalysisJob.analysis_id).filter(
+        AnalysisJob.status.in_(["queued", "running"])
+    )
+
+    rows = (
+        db.query(ranked.c.id)
+        .filter(
+            ranked.c.rank > keep_latest,
+            ranked.c.analyzed_at < cutoff,
+            ranked.c.id.notin_(busy)
+        )
+        .order_by(ranked.c.analyzed_at)
+        .limit(BATCH_RUNS)
+        .all()
+    )
+    return [run_id for (run_id,) in rows]
+
+
+def _archive_batch(db: Session, run_ids: list) -> dict:
+    runs = (
+        db.query(
+            AnalysisRun.id,
+            AnalysisRun.user_id,
+            AnalysisRun.channel_url,
+            AnalysisRun.analyzed_at,
+            AnalysisSummary.own_total_videos,
+            AnalysisSummary.own_avg_engagement
+        )
+        .outerjoin(
+            AnalysisSummary, AnalysisSummary.analysis_id == AnalysisRun.id
+        )
+        .filter(AnalysisRun.id.in_(run_ids))
+        .all()
+    )
+    partition = {
+        run.id: {"user_id": run.user_id,
+                 "month": run.analyzed_at.strftime("%Y-%m")}
+        for run in runs
+    }
+
+    videos = [
+        {
+            "analysis_id": v.analysis_id,
+            **partition[v.analysis_id],
+            "video_id": v.video_id,
+            "source": v.source,
+            "title": v.title,
+            "views": v.views,
+            "likes": v.likes,
+            "comments": v.comments,
+            "engagement_rate": v.engagement_rate,
+        }
+        for v in db.query(
+            Video.analysis_id,
+            Video.video_id,
+            Video.source,
+            Video.title,
+            Video.views,
+            Video.likes,
+            Video.comments,
+            Video.engagement_rate
+        ).filter(Video.analysis_id.in_(run_ids))
+    ]
+
+    # Runs from before summaries existed: roll up from their videos
+    own_rates = {}
+    for v in videos:
+        if v["source"] == "own":
+            own_rates.setdefault(v["analysis_id"], []).append(
+                v["engagement_rate"] or 0
+            )
+
+    run_rows = []
+    for run in runs:
+        own_total, own_avg = run.own_total_videos, run.own_avg_engagement
+        if own_total is None:
+            rates = own_rates.get(run.id, [])
+            own_total = len(rates)
+            own_avg = sum(rates) / len(rates) if rates else 0
+        run_rows.append({
+            "analysis_id": run.id,
+            **partition[run.id],
+            "channel_url": run.channel_url,
+            "analyzed_at": run.analyzed_at,
+            "own_total_videos": own_total,
+            "own_avg_engagement": own_avg,
+        })
+
+    # Files first: a crash before the delete only leaves a duplicate,
+    # which archived_runs drops
+    _write("videos", videos, VIDEO_SCHEMA)
+    _write("runs", run_rows, RUN_SCHEMA)
+
+    for column in (
+        Video.analysis_id,
+        TitleTerm.analysis_id,
+        AnalysisSummary.analysis_id,
+        AnalysisJob.analysis_id,
+        AnalysisRun.id
+    ):
+        db.query(column.class_).filter(column.in_(run_ids)).delete(
+            synchronize_session=False
+        )
+    db.commit()
+
+    # The oldest live run's key changes with its "previous" run; only
+    # the archived runs' own entries are dead
+    for run in runs:
+        insights_cache.invalidate_analysis(run.id)
+
+    return {"runs": len(run_rows), "videos": len(videos)}
+
+
+def archive_old_runs(
+    older_than_days: int = ARCHIVE_AFTER_DAYS,
+    keep_latest: int = ARCHIVE_KEEP_LATEST
+) -> dict:
+    """
+    Moves every eligible run to Parquet, BATCH_RUNS runs per commit.
+    Does nothing when older_than_days is 0 (archiving disabled).
+    """
+    totals = {"runs": 0, "videos": 0}
+    if older_than_days <= 0:
+        return totals
+    cutoff = datetime.utcnow() - timedelta(days=older_than_days)
+
+    db = SessionLocal()
+    try:
+        while True:
+            run_ids = _runs_to_archive(db, cutoff, keep_latest)
+            if not run_ids:
+                break
+            batch = _archive_batch(db, run_ids)
+            totals["runs"] += batch["runs"]
+            totals["videos"] += batch["videos"]
+    finally:
+        db.close()
+
+    if totals["runs"]:
+        logger.info(
+            "Archived %s runs (%s videos) to %s",
+            totals["runs"], totals["videos"], ARCHIVE_PATH
+        )
+    return totals
+
+
+def _naive_utc(value: datetime):
+    """Archive timestamps are naive UTC, like analyzed_at in the DB."""
+    if value is not None and value.tzinfo is not None:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def archived_runs(
+    user_id: int,
+    start: datetime = None,
+    end: datetime = None,
+    before: tuple = None,
+    limit: int = None
+) -> list:
+    """
+    Archived runs of a user as dicts, newest first. `before` is an
+    (analyzed_at, id) keyset position; start/end also prune month
+    partitions.
+    """
+    path = _dataset_path("runs")
+    if not os.path.isdir(path):
+        return []
+
+    start, end = _naive_utc(start), _naive_utc(end)
+    if before is not None:
+        before = (_naive_utc(before[0]), before[1])
+
+    condition = ds.field("user_id") == user_id
+    if start is not None:
+        condition &= ds.field("month") >= start.strftime("%Y-%m")
+        condition &= ds.field("analyzed_at") >= start
+    if end is not None:
+        condition &= ds.field("month") <= end.strftime("%Y-%m")
+        condition &= ds.field("analyzed_at") <= end
+    if before is not None:
+        condition &= ds.field("analyzed_at") <= before[0]
+
+    dataset = ds.dataset(path, format="parquet", partitioning=PARTITIONING)
+    rows = {
+        row["analysis_id"]: row
+        for row in dataset.to_table(filter=condition).to_pylist()
+    }
+    runs = sorted(
+        rows.values(),
+        key=lambda r: (r["analyzed_at"], r["analysis_id"]),
+        reverse=True
+    )
+    if before is not None:
+        runs = [
+            r for r in runs if (r["analyzed_at"], r["analysis_id"]) < before
+        ]
+    return runs[:limit] if limit is not None else runs
+
+
+def archived_trend(user_id: int, start=None, end=None) -> list:
+    """engagement_trend points of archived runs, oldest first."""
+    return [
+        (r["analysis_id"], r["analyzed_at"], r["own_avg_engagement"])
+        for r in reversed(archived_runs(user_id, start=start, end=end))
+        if r["own_total_videos"]
+    ]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Move old analysis runs to Parquet cold storage."
+    )
+    parser.add_argument(
+        "--older-than-days", type=int, default=ARCHIVE_AFTER_DAYS,
+        help="archive runs older than this (default: ARCHIVE_AFTER_DAYS)"
+    )
+    parser.add_argument(
+        "--keep-latest", type=int, default=ARCHIVE_KEEP_LATEST,
+        help="always keep each user's latest N runs in the database"
+    )
+    args = parser.parse_args()
+
+    if args.older_than_days <= 0:
+        print("Archiving is disabled: set ARCHIVE_AFTER_DAYS "
+              "or pass --older-than-days")
+    else:
+        # Same schema upgrade the API runs at startup
+        Base.metadata.create_all(bind=engine)
+        run_migrations(engine)
+        totals = archive_old_runs(args.older_than_days, args.keep_latest)
+        print(f"Archived {totals['runs']} runs ({totals['videos']} videos) "
+              f"to {ARCHIVE_PATH}")
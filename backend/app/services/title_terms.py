@@ -0,0 +1,54 @@
+from sqlalchemy.orm import Session
+
+from app.models.analysis import TitleTerm, Video
+from app.services.topics import term_scores
+
+
+def build_title_terms(db: Session, analysis_id: int):
+    """
+    Rebuilds the term -> engagement score index of a run from its video
+    titles. Does not commit.
+    """
+    videos = db.query(
+        Video.source, Video.title, Video.engagement_rate
+    ).filter(Video.analysis_id == analysis_id).all()
+
+    by_source = {}
+    for v in videos:
+        by_source.setdefault(v.source, []).append(v)
+
+    db.query(TitleTerm).filter(
+        TitleTerm.analysis_id == analysis_id
+    ).delete(synchronize_session=False)
+
+    rows = [
+        {
+            "analysis_id": analysis_id,
+            "source": source,
+            "term": term,
+            "score": score,
+        }
+        for source, source_videos in by_source.items()
+        for term, score in term_scores(source_videos).items()
+    ]
+    if rows:
+        db.execute(TitleTerm.__table__.insert(), rows)
+
+
+def top_terms_query(
+    db: Session, analysis_id: int, source: str, limit: int = 8
+):
+    return (
+        db.query(TitleTerm.term)
+        .filter(
+            TitleTerm.analysis_id == analysis_id,
+            TitleTerm.source == source
+        )
+        .order_by(TitleTerm.score.desc())
+        .limit(limit)
+    )
+
+
+def top_terms(db: Session, analysis_id: int, source: str, limit: int = 8):
+    rows = top_terms_query(db, analysis_id, source, limit).all()
+    return [term for (term,) in rows]
@@ -0,0 +1,47 @@
+STOPWORDS = {
+    "the", "a", "an", "and", "or", "of", "to", "in", "on", "for",
+    "with", "your", "you", "my", "our", "is", "are", "was", "were",
+    "how", "why", "what", "this", "that", "these", "those", "from",
+    "by", "at", "as", "it", "be", "will", "vs", "ft", "feat"
+}
+
+
+def title_terms(title):
+    """Lowercased title words without punctuation, stopwords or short words."""
+    words = [
+        w.strip(".,!?()[]{}\"'").lower()
+        for w in (title or "").lower().split()
+    ]
+    return [w for w in words if len(w) >= 3 and w not in STOPWORDS]
+
+
+def term_scores(videos):
+    """term -> summed engagement of the videos whose title contains it."""
+    scores = {}
+    for v in videos:
+        for w in title_terms(v.title):
+            scores[w] = scores.get(w, 0) + max(v.engagement_rate, 0)
+    return scores
+
+
+def extract_topics(videos, limit=8):
+    ranked = sorted(
+        term_scores(videos).items(), key=lambda x: x[1], reverse=True
+    )
+    return [w for w, _ in ranked[:limit]]
+
+
+def find_topic_gaps(competitor_topics, own_topics, limit=5):
+    """Competitor topics the own channel doesn't cover, in rank order."""
+    own = set(own_topics)
+    return [t for t in competitor_topics if t not in own][:limit]
+
+
+def build_niche_query(competitor_topics, own_topics, limit=5):
+    pool = []
+    for t in competitor_topics + own_topics:
+        if t not in pool:
+            pool.append(t)
+        if len(pool) >= limit:
+            break
+    return " ".join(pool)
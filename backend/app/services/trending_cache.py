@@ -0,0 +1,145 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from app.youtube.quota import QuotaExhausted, quota_context, BACKGROUND
+from app.youtube.youtube_fetch import fetch_trending_videos_by_query
+
+TRENDING_TTL = 6 * 3600
+# Queries asked for at least this often between refresher passes are
+# "hot" and get refreshed before they expire.
+HOT_QUERY_HITS = 3
+REFRESH_AHEAD = 30 * 60
+REFRESH_INTERVAL = 5 * 60
+# A failed fetch is cached (keeping any older videos) for this long
+# before the query is tried again
+FAILURE_BACKOFF = 5 * 60
+MAX_ENTRIES = 1000
+TRENDING_RESULTS = 6
+
+
+def normalize_query(query: str) -> str:
+    return " ".join((query or "").lower().split())
+
+
+class TrendingCache:
+    """
+    Trending search results keyed by (normalized niche query, region).
+
+    Reads never call the API: a miss or a stale entry only schedules a
+    background fetch, and hot queries are refreshed ahead of expiry.
+    Failed fetches are cached too, for FAILURE_BACKOFF seconds.
+    """
+
+    def __init__(self, ttl: float = TRENDING_TTL):
+        self.ttl = ttl
+        self._entries = {}
+        self._in_flight = set()
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=2)
+
+    def get(self, query: str, region_code: str):
+        """Returns cached videos, or None if the query was never fetched."""
+        key = (normalize_query(query), region_code)
+        if not key[0]:
+            return []
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry:
+                entry["hits"] += 1
+
+        if entry is None or time.time() > entry["expires_at"]:
+            self.schedule_refresh(*key)
+
+        return entry["videos"] if entry else None
+
+    def schedule_refresh(self, query: str, region_code: str):
+        key = (normalize_query(query), region_code)
+        if not key[0]:
+            return
+        with self._lock:
+            if key in self._in_flight:
+                return
+            self._in_flight.add(key)
+        self._executor.submit(self._refresh, key)
+
+    def _refresh(self, key):
+        query, region_code = key
+        try:
+            with quota_context(None, BACKGROUND):
+                videos = fetch_trending_videos_by_query(
+                    query,
+                    max_results=TRENDING_RESULTS,
+                    region_code=region_code
+                )
+        except QuotaExhausted:
+            return
+        except Exception as e:
+            print("Trending refresh failed:", e)
+            self._store(key, None, FAILURE_BACKOFF)
+            return
+        finally:
+            with self._lock:
+                self._in_flight.discard(key)
+
+        self._store(key, videos, self.ttl)
+
+    def _store(self, key, videos, ttl: float):
+        """Caches videos for `ttl` seconds; None keeps the previous ones."""
+        now = time.time()
+        with self._lock:
+            previous = self._entries.get(key, {})
+            self._entries[key] = {
+                "videos": (
+                    videos if videos is not None
+                    else previous.get("videos", [])
+                ),
+                "fetched_at": (
+                    now if videos is not None
+                    else previous.get("fetched_at", now)
+                ),
+                "expires_at": now + ttl,
+                "hits": previous.get("hits", 0),
+            }
+            self._evict()
+
+    def _evict(self):
+        overflow = len(self._entries) - MAX_ENTRIES
+        if overflow > 0:
+            coldest = sorted(
+                self._entries,
+                key=lambda k: (self._entries[k]["hits"],
+                               self._entries[k]["fetched_at"])
+            )
+            for key in coldest[:overflow]:
+                del self._entries[key]
+
+    def refresh_hot_queries(self):
+        now = time.time()
+        with self._lock:
+            hot = [
+                key for key, entry in self._entries.items()
+                if entry["hits"] >= HOT_QUERY_HITS
+                and entry["expires_at"] - now < REFRESH_AHEAD
+            ]
+            for entry in self._entries.values():
+                entry["hits"] = 0
+
+        for key in hot:
+            self.schedule_refresh(*key)
+
+
+trending_cache = TrendingCache()
+
+
+def _refresher_loop():
+    while True:
+        time.sleep(REFRESH_INTERVAL)
+        trending_cache.refresh_hot_queries()
+
+
+def start_trending_refresher():
+    threading.Thread(
+        target=_refresher_loop, name="trending-refresher", daemon=True
+    ).start()
@@ -0,0 +1,109 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from types import MappingProxyType
+
+USER_CACHE_TTL = 60
+MAX_ENTRIES = 10000
+
+SNAPSHOT_FIELDS = (
+    "id", "name", "email", "role", "goal", "onboarding_complete",
+    "weekly_summary_enabled", "competitor_alerts_enabled",
+)
+
+
+class CurrentUser:
+    """
+    Read-only copy of a User row (without the password hash), shared by
+    every request that presents the same token.
+    """
+
+    __slots__ = ("_fields",)
+
+    def __init__(self, fields: dict):
+        object.__setattr__(self, "_fields", MappingProxyType(dict(fields)))
+
+    @classmethod
+    def from_user(cls, user):
+        return cls({name: getattr(user, name) for name in SNAPSHOT_FIELDS})
+
+    def __getattr__(self, name):
+        try:
+            return self._fields[name]
+        except KeyError:
+            raise AttributeError(name)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("CurrentUser is read-only")
+
+
+def _token_key(token: str) -> str:
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+class CurrentUserCache:
+    """
+    Verified JWT -> CurrentUser, so authenticated requests skip both the
+    token decode and the users lookup.
+
+    Entries live USER_CACHE_TTL seconds and never past the token's exp.
+    They are dropped when the user's row changes in this process, and
+    the least recently used go once MAX_ENTRIES is reached. With several
+    workers the TTL bounds how stale another worker's copy can be.
+    """
+
+    def __init__(self, ttl: float = USER_CACHE_TTL,
+                 max_entries: int = MAX_ENTRIES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()  # token key -> (expires_at, user)
+        self._lock = threading.Lock()
+
+    def get(self, token: str):
+        key = _token_key(token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= time.time():
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, token: str, user: CurrentUser, token_exp=None):
+        expires_at = time.time() + self.ttl
+        if token_exp is not None:
+            expires_at = min(expires_at, token_exp)
+
+        key = _token_key(token)
+        with self._lock:
+            self._entries[key] = (expires_at, user)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate_user(self, user_id: int):
+        with self._lock:
+            for key in [
+                k for k, (_, user) in self._entries.items()
+                if user.id == user_id
+            ]:
+                del self._entries[key]
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else None,
+            }
+
+
+current_user_cache = CurrentUserCache()
@@ -0,0 +1,77 @@
+import csv
+import io
+import json
+
+from app.database import SessionLocal
+from app.models.analysis import Video
+
+EXPORT_COLUMNS = (
+    "video_id", "source", "title", "views", "likes", "comments",
+    "engagement_rate",
+)
+CHUNK_SIZE = 1000
+
+
+def iter_video_rows(analysis_id: int, chunk_size: int = CHUNK_SIZE):
+    """
+    Yields the videos of a run as plain dicts, fetched from the cursor
+    chunk_size rows at a time (yield_per), so memory does not grow with
+    the run size.
+    Uses its own session: a streamed response outlives the request's
+    get_db session.
+    """
+    db = SessionLocal()
+    try:
+        query = (
+            db.query(*(getattr(Video, name) for name in EXPORT_COLUMNS))
+            .filter(Video.analysis_id == analysis_id)
+            .order_by(Video.id)
+            .execution_options(stream_results=True)
+            .yield_per(chunk_size)
+        )
+        for row in query:
+            yield dict(zip(EXPORT_COLUMNS, row))
+    finally:
+        db.close()
+
+
+def _chunked(lines, chunk_size: int):
+    buffer = []
+    for line in lines:
+        buffer.append(line)
+        if len(buffer) >= chunk_size:
+            yield "".join(buffer)
+            buffer = []
+    if buffer:
+        yield "".join(buffer)
+
+
+def ndjson_chunks(analysis_id: int, chunk_size: int = CHUNK_SIZE):
+    """One JSON object per line, sent chunk_size lines per write."""
+    lines = (
+        json.dumps(row) + "\n"
+        for row in iter_video_rows(analysis_id, chunk_size)
+    )
+    return _chunked(lines, chunk_size)
+
+
+def csv_chunks(analysis_id: int, chunk_size: int = CHUNK_SIZE):
+    """Header line, then one CSV line per video."""
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=EXPORT_COLUMNS)
+
+    def take():
+        line = buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+        return line
+
+    def lines():
+        # Sent even when the run has no videos
+        writer.writeheader()
+        yield take()
+        for row in iter_video_rows(analysis_id, chunk_size):
+            writer.writerow(row)
+            yield take()
+
+    return _chunked(lines(), chunk_size)
@@ -0,0 +1,188 @@
+from datetime import datetime, timedelta
+
+import numpy as np
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.models.analysis import Video, VideoSnapshot, VideoStatsHead
+from app.services.video_stats import top_k_indices, velocity_metrics
+
+# A video fetched again within this window (by another run or user)
+# does not get a new snapshot
+MIN_SNAPSHOT_INTERVAL = timedelta(hours=1)
+# Stay below SQLite's bound-parameter limit in IN (...) lists
+IN_CHUNK = 500
+# captured_at of a head created before the video's first snapshot
+NO_SNAPSHOT = datetime(1970, 1, 1)
+
+
+def _chunks(values: list, size: int = IN_CHUNK):
+    for i in range(0, len(values), size):
+        yield values[i:i + size]
+
+
+def _insert_missing_heads(db: Session, video_ids: list):
+    """Zero heads for videos that have none yet, ignoring existing ones."""
+    insert = (
+        postgresql.insert if db.bind.dialect.name == "postgresql"
+        else sqlite.insert
+    )
+    for chunk in _chunks(video_ids):
+        db.execute(
+            insert(VideoStatsHead)
+            .values([
+                {"video_id": video_id, "views": 0, "likes": 0,
+                 "comments": 0, "captured_at": NO_SNAPSHOT}
+                for video_id in chunk
+            ])
+            .on_conflict_do_nothing(index_elements=["video_id"])
+        )
+
+
+def record_snapshots(db: Session, videos: list, captured_at=None) -> int:
+    """
+    Appends a delta-encoded snapshot for each fetched video (dicts with
+    video_id / views / likes / comments) and moves its head forward.
+    Does not commit: runs in the ingest transaction.
+    Returns the number of snapshots written.
+
+    Heads are created first and then read locked (FOR UPDATE; on SQLite
+    the insert already holds the write lock), so concurrent ingests of
+    the same video serialize instead of deriving deltas from the same
+    head.
+    """
+    captured_at = captured_at or datetime.utcnow()
+    latest = {v["video_id"]: v for v in videos}
+    if not latest:
+        return 0
+
+    video_ids = sorted(latest)
+    _insert_missing_heads(db, video_ids)
+
+    heads = {}
+    for chunk in _chunks(video_ids):
+        for head in (
+            db.query(VideoStatsHead)
+            .filter(VideoStatsHead.video_id.in_(chunk))
+            .order_by(VideoStatsHead.video_id)
+            .with_for_update()
+            .populate_existing()
+        ):
+            heads[head.video_id] = head
+
+    snapshots = []
+    head_updates = []
+    for video_id, video in latest.items():
+        head = heads[video_id]
+        if captured_at - head.captured_at < MIN_SNAPSHOT_INTERVAL:
+            continue
+
+        counts = {
+            "views": video["views"] or 0,
+            "likes": video["likes"] or 0,
+            "comments": video["comments"] or 0,
+        }
+        snapshots.append({
+            "video_id": video_id,
+            "captured_at": captured_at,
+            **{
+                f"{name}_delta": value - (getattr(head, name) or 0)
+                for name, value in counts.items()
+            }
+        })
+        head_updates.append(
+            {"video_id": video_id, "captured_at": captured_at, **counts}
+        )
+
+    if snapshots:
+        db.execute(VideoSnapshot.__table__.insert(), snapshots)
+    if head_updates:
+        db.bulk_update_mappings(VideoStatsHead, head_updates)
+    return len(snapshots)
+
+
+def snapshots_query(db: Session, video_ids: list):
+    """Snapshot rows of at most IN_CHUNK videos, in decoding order."""
+    return (
+        db.query(
+            VideoSnapshot.video_id,
+            VideoSnapshot.captured_at,
+            VideoSnapshot.views_delta,
+            VideoSnapshot.likes_delta,
+            VideoSnapshot.comments_delta
+        )
+        .filter(VideoSnapshot.video_id.in_(video_ids))
+        .order_by(VideoSnapshot.video_id, VideoSnapshot.captured_at)
+    )
+
+
+def load_snapshots(db: Session, video_ids: list) -> dict:
+    """
+    Snapshot history of the given videos as columnar arrays, sorted by
+    (video_id, captured_at), with the deltas decoded back into absolute
+    counts.
+    """
+    rows = []
+    for chunk in _chunks(sorted(set(video_ids))):
+        rows.extend(snapshots_query(db, chunk).all())
+
+    ids = np.array([r[0] for r in rows], dtype=object)
+    series = {
+        "video_id": ids,
+        "hours": np.array(
+            [r[1].timestamp() / 3600 for r in rows], dtype=np.float64
+        ),
+    }
+
+    # Cumulative sum per video: global cumsum minus the running total
+    # at the start of each video's segment
+    starts = np.flatnonzero(
+        np.r_[True, ids[1:] != ids[:-1]] if len(ids) else []
+    )
+    counts = np.diff(np.r_[starts, len(ids)])
+    for i, name in enumerate(("views", "likes", "comments"), start=2):
+        deltas = np.array([r[i] or 0 for r in rows], dtype=np.int64)
+        total = np.cumsum(deltas)
+        before = np.r_[0, total][starts]
+        series[name] = total - np.repeat(before, counts)
+
+    series["starts"] = starts
+    return series
+
+
+def _number(value):
+    return None if np.isnan(value) else round(float(value), 6)
+
+
+def own_velocity(db: Session, analysis_id: int, k: int = 5) -> dict:
+    """Views/hour and engagement acceleration of a run's own videos."""
+    titles = dict(
+        db.query(Video.video_id, Video.title).filter(
+            Video.analysis_id == analysis_id,
+            Video.source == "own"
+        ).all()
+    )
+    metrics = velocity_metrics(load_snapshots(db, list(titles)))
+
+    views_per_hour = metrics["views_per_hour"]
+    tracked = ~np.isnan(views_per_hour)
+    fastest = top_k_indices(np.where(tracked, views_per_hour, -np.inf), k)
+
+    return {
+        "tracked_videos": int(tracked.sum()),
+        "avg_views_per_hour": (
+            _number(views_per_hour[tracked].mean()) if tracked.any() else None
+        ),
+        "fastest_growing": [
+            {
+                "video_id": metrics["video_id"][i],
+                "title": titles.get(metrics["video_id"][i]),
+                "views_per_hour": _number(views_per_hour[i]),
+                "engagement_acceleration": _number(
+                    metrics["engagement_acceleration"][i]
+                ),
+                "snapshots": int(metrics["snapshots"][i]),
+            }
+            for i in fastest if tracked[i]
+        ],
+    }
@@ -0,0 +1,169 @@
+import numpy as np
+from sqlalchemy.orm import Session
+
+from app.models.analysis import Video
+
+PERCENTILES = (25, 50, 75, 90)
+
+
+def video_columns_query(db: Session, analysis_id: int):
+    """The one projected query load_video_columns reads a run with."""
+    return db.query(
+        Video.source,
+        Video.title,
+        Video.views,
+        Video.likes,
+        Video.comments,
+        Video.engagement_rate
+    ).filter(Video.analysis_id == analysis_id)
+
+
+def load_video_columns(db: Session, analysis_id: int) -> dict:
+    """
+    All videos of a run as columnar arrays (one projected query),
+    keyed by column name plus "title" and "source" lists.
+    """
+    rows = video_columns_query(db, analysis_id).all()
+
+    return {
+        "source": np.array([r.source for r in rows], dtype=object),
+        "title": np.array([r.title for r in rows], dtype=object),
+        "views": np.array([r.views or 0 for r in rows], dtype=np.int64),
+        "likes": np.array([r.likes or 0 for r in rows], dtype=np.int64),
+        "comments": np.array(
+            [r.comments or 0 for r in rows], dtype=np.int64
+        ),
+        "engagement_rate": np.array(
+            [r.engagement_rate or 0 for r in rows], dtype=np.float64
+        ),
+    }
+
+
+def select(columns: dict, mask) -> dict:
+    """Rows of `columns` where mask is True, e.g. one source."""
+    return {name: values[mask] for name, values in columns.items()}
+
+
+def _videos_at(columns: dict, indices) -> list:
+    return [
+        {
+            "title": columns["title"][i],
+            "engagement_rate": float(columns["engagement_rate"][i])
+        }
+        for i in indices
+    ]
+
+
+def top_k_indices(values, k: int):
+    """Indices of the k largest values, largest first."""
+    if k <= 0 or not len(values):
+        return np.array([], dtype=np.int64)
+    k = min(k, len(values))
+    part = np.argpartition(-values, k - 1)[:k]
+    return part[np.argsort(-values[part], kind="stable")]
+
+
+def bottom_k_indices(values, k: int):
+    """Indices of the k smallest values, in largest-first order."""
+    if k <= 0 or not len(values):
+        return np.array([], dtype=np.int64)
+    k = min(k, len(values))
+    part = np.argpartition(values, k - 1)[:k]
+    return part[np.argsort(-values[part], kind="stable")]
+
+
+def engagement_stats(columns: dict, k: int = 3, low_ratio: float = 0.6):
+    """
+    Engagement statistics of a video set in one pass over its columns:
+    mean/median/percentiles, z-scores, top-k/bottom-k videos and
+    high (> mean) / low (< low_ratio * mean) performer masks.
+    """
+    rates = columns["engagement_rate"]
+    total = len(rates)
+
+    if not total:
+        return {
+            "total_videos": 0,
+            "avg_views": 0,
+            "avg_engagement": 0,
+            "median_engagement": 0,
+            "percentiles": {f"p{p}": 0 for p in PERCENTILES},
+            "zscores": rates,
+            "high_mask": rates > 0,
+            "low_mask": rates > 0,
+            "top": [],
+            "bottom": [],
+        }
+
+    mean = rates.mean()
+    std = rates.std()
+    percentiles = np.percentile(rates, PERCENTILES)
+
+    return {
+        "total_videos": total,
+        "avg_views": float(columns["views"].mean()),
+        "avg_engagement": float(mean),
+        "median_engagement": float(percentiles[1]),
+        "percentiles": {
+            f"p{p}": float(value) for p, value in zip(PERCENTILES, percentiles)
+        },
+        "zscores": (rates - mean) / std if std else np.zeros(total),
+        "high_mask": rates > mean,
+        "low_mask": rates < mean * low_ratio,
+        "top": _videos_at(columns, top_k_indices(rates, k)),
+        "bottom": _videos_at(columns, bottom_k_indices(rates, k)),
+    }
+
+
+def ranked(columns: dict) -> list:
+    """All videos (title + engagement), best first."""
+    order = np.argsort(-columns["engagement_rate"], kind="stable")
+    return _videos_at(columns, order)
+
+
+def velocity_metrics(series: dict) -> dict:
+    """
+    Per-video growth from snapshot series (see load_snapshots), on whole
+    arrays: views/hour between the last two snapshots and engagement
+    acceleration (change of the engagement-rate slope, per hour) over
+    the last three. NaN where a video has too few snapshots.
+    """
+    ids = series["video_id"]
+    starts = series["starts"]
+    n = len(starts)
+    ends = (
+        np.r_[starts[1:], len(ids)].astype(np.int64) - 1 if n
+        else starts.astype(np.int64)
+    )
+    counts = ends - starts + 1
+
+    hours = series["hours"]
+    views = series["views"].astype(np.float64)
+    engagement = np.divide(
+        (series["likes"] + series["comments"]).astype(np.float64),
+        views,
+        out=np.zeros_like(views),
+        where=views > 0
+    )
+
+    prev = np.where(counts >= 2, ends - 1, ends)
+    prev2 = np.where(counts >= 3, ends - 2, prev)
+    dt1 = hours[ends] - hours[prev]
+    dt2 = hours[prev] - hours[prev2]
+
+    views_per_hour = np.full(n, np.nan)
+    ok = dt1 > 0
+    views_per_hour[ok] = (views[ends] - views[prev])[ok] / dt1[ok]
+
+    acceleration = np.full(n, np.nan)
+    ok = (dt1 > 0) & (dt2 > 0)
+    slope = (engagement[ends] - engagement[prev])[ok] / dt1[ok]
+    prev_slope = (engagement[prev] - engagement[prev2])[ok] / dt2[ok]
+    acceleration[ok] = (slope - prev_slope) / ((dt1[ok] + dt2[ok]) / 2)
+
+    return {
+        "video_id": ids[starts],
+        "snapshots": counts,
+        "views_per_hour": views_per_hour,
+        "engagement_acceleration": acceleration,
+    }
@@ -0,0 +1,44 @@
+from sqlalchemy.orm import Session
+
+
+def explain_query_plan(db: Session, query) -> list[str]:
+    """
+    Returns the SQLite EXPLAIN QUERY PLAN detail lines of an ORM query,
+    e.g. ["SEARCH videos USING COVERING INDEX ix_... (analysis_id=?)"].
+    """
+    statement = getattr(query, "statement", query)
+    connection = db.connection()
+    # Expand IN (...) lists into one placeholder per value
+    compiled = statement.compile(
+        dialect=connection.dialect,
+        compile_kwargs={"render_postcompile": True}
+    )
+    params = tuple(compiled.params[name] for name in compiled.positiontup)
+
+    rows = connection.exec_driver_sql(
+        "EXPLAIN QUERY PLAN " + str(compiled), params
+    ).fetchall()
+    return [row[-1] for row in rows]
+
+
+def assert_uses_index(db: Session, query, index_name: str, covering=False):
+    """
+    Fails unless the plan searches through `index_name` (as a covering
+    index when covering=True) without full scans or temp sort trees.
+    """
+    plan = explain_query_plan(db, query)
+    text = "\n".join(plan)
+
+    expected = (
+        f"USING COVERING INDEX {index_name}" if covering
+        else f"INDEX {index_name}"
+    )
+    assert expected in text, f"{expected!r} not in plan:\n{text}"
+
+    for line in plan:
+        assert not (line.startswith("SCAN") and "INDEX" not in line), (
+            f"full table scan in plan:\n{text}"
+        )
+        assert "USE TEMP B-TREE" not in line, (
+            f"temp sort in plan:\n{text}"
+        )
@@ -0,0 +1,66 @@
+import re
+from datetime import datetime, timedelta
+
+from app.database import SessionLocal
+from app.models.analysis import ChannelHandle
+
+# Unknown handles are remembered for a day so typos don't cost a lookup
+# on every analysis, but a newly created channel still resolves soon.
+NEGATIVE_TTL = timedelta(days=1)
+
+HANDLE_RE = re.compile(r"youtube\.com/@([A-Za-z0-9_.-]+)")
+CHANNEL_ID_RE = re.compile(r"youtube\.com/channel/([A-Za-z0-9_-]+)")
+
+
+def parse_handle(channel_url: str):
+    match = HANDLE_RE.search(channel_url)
+    return match.group(1).lower() if match else None
+
+
+def parse_channel_id(channel_url: str):
+    match = CHANNEL_ID_RE.search(channel_url)
+    return match.group(1) if match else None
+
+
+def lookup_handles(handles):
+    """
+    Returns {handle: channel_id} for every handle already in the index.
+    A value of None means the handle is known not to exist.
+    Handles that were never resolved (or whose negative entry expired)
+    are left out.
+    """
+    if not handles:
+        return {}
+
+    db = SessionLocal()
+    try:
+        rows = db.query(ChannelHandle).filter(
+            ChannelHandle.handle.in_(set(handles))
+        ).all()
+    finally:
+        db.close()
+
+    negative_cutoff = datetime.utcnow() - NEGATIVE_TTL
+    return {
+        row.handle: row.channel_id
+        for row in rows
+        if row.channel_id is not None or row.resolved_at > negative_cutoff
+    }
+
+
+def store_handles(resolved):
+    """Saves {handle: channel_id or None} into the index."""
+    if not resolved:
+        return
+
+    db = SessionLocal()
+    try:
+        for handle, channel_id in resolved.items():
+            db.merge(ChannelHandle(
+                handle=handle,
+                channel_id=channel_id,
+                resolved_at=datetime.utcnow()
+            ))
+        db.commit()
+    finally:
+        db.close()
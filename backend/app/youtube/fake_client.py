@@ -0,0 +1,216 @@
+"""
+Offline stand-ins for the googleapiclient YouTube client.
+
+They answer the same client.<resource>().<method>(**params).execute()
+chain as the live client, so every fetch path in youtube_fetch works
+unchanged. Selected with YOUTUBE_BACKEND (see get_youtube_client):
+
+- "synthetic": generates deterministic fake channels and videos
+- "replay": serves responses recorded earlier from YOUTUBE_FIXTURES_PATH
+- "record": calls the live API and saves every response as a fixture
+"""
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+from datetime import datetime, timedelta
+
+import httplib2
+from googleapiclient.errors import HttpError
+
+from app.youtube.response_cache import make_cache_key
+
+WORDS = [
+    "budget", "travel", "coding", "python", "fitness", "routine", "vlog",
+    "morning", "productivity", "study", "recipe", "review", "setup",
+    "challenge", "guide", "beginner", "tips", "minimal", "desk", "habits",
+]
+
+
+def _seed(*parts) -> int:
+    digest = hashlib.md5(":".join(map(str, parts)).encode()).hexdigest()
+    return int(digest[:12], 16)
+
+
+def _http_error(status: int, message: str):
+    body = json.dumps({"error": {"code": status, "message": message}})
+    return HttpError(httplib2.Response({"status": status}), body.encode())
+
+
+class _Request:
+    def __init__(self, client, endpoint, params):
+        self._client = client
+        self._endpoint = endpoint
+        self._params = params
+
+    def execute(self):
+        return self._client.execute(self._endpoint, self._params)
+
+
+class _Resource:
+    def __init__(self, client, name):
+        self._client = client
+        self._name = name
+
+    def list(self, **params):
+        return _Request(self._client, f"{self._name}.list", params)
+
+
+class FakeYouTubeClient:
+    """Base class: latency and error injection around `respond`."""
+
+    def __init__(self, latency_ms: float = 0, error_rate: float = 0):
+        self.latency_ms = latency_ms
+        self.error_rate = error_rate
+        self.calls = 0
+        self._random = random.Random()
+
+    def __getattr__(self, name):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return lambda: _Resource(self, name)
+
+    def execute(self, endpoint: str, params: dict):
+        self.calls += 1
+        if self.latency_ms:
+            time.sleep(self.latency_ms / 1000)
+        if self.error_rate and self._random.random() < self.error_rate:
+            raise _http_error(503, "Injected backend error")
+        return self.respond(endpoint, params)
+
+    def respond(self, endpoint: str, params: dict):
+        raise NotImplementedError
+
+
+class SyntheticYouTubeClient(FakeYouTubeClient):
+    """Deterministic fake data: the same request always gets the same answer."""
+
+    def __init__(self, videos_per_channel: int = 200, **kwargs):
+        super().__init__(**kwargs)
+        self.videos_per_channel = videos_per_channel
+
+    def respond(self, endpoint: str, params: dict):
+        handlers = {
+            "channels.list": self._channels,
+            "playlistItems.list": self._playlist_items,
+            "videos.list": self._videos,
+            "search.list": self._search,
+        }
+        if endpoint not in handlers:
+            raise _http_error(404, f"Unknown endpoint {endpoint}")
+        return handlers[endpoint](params)
+
+    def _channels(self, params):
+        if "forHandle" in params:
+            channel_id = "UC" + str(_seed("handle", params["forHandle"].lower()))
+        else:
+            channel_id = params["id"]
+        return {"items": [{
+            "id": channel_id,
+            "contentDetails": {
+                "relatedPlaylists": {"uploads": "UU" + channel_id[2:]}
+            }
+        }]}
+
+    def _page(self, prefix, offset, limit, total):
+        ids = [f"{prefix}-{i}" for i in range(offset, min(offset + limit, total))]
+        next_offset = offset + limit
+        return ids, (str(next_offset) if next_offset < total else None)
+
+    def _playlist_items(self, params):
+        offset = int(params.get("pageToken") or 0)
+        ids, next_token = self._page(
+            params["playlistId"], offset,
+            params.get("maxResults", 5), self.videos_per_channel
+        )
+        response = {"items": [
+            {"contentDetails": {"videoId": video_id}} for video_id in ids
+        ]}
+        if next_token:
+            response["nextPageToken"] = next_token
+        return response
+
+    def _search(self, params):
+        prefix = "SQ" + str(_seed(params.get("q"), params.get("channelId")))
+        ids, _ = self._page(prefix, 0, params.get("maxResults", 5), 50)
+        return {"items": [
+            {"id": {"kind": "youtube#video", "videoId": video_id}}
+            for video_id in ids
+        ]}
+
+    def _videos(self, params):
+        return {"items": [
+            self._video(video_id) for video_id in params["id"].split(",")
+        ]}
+
+    def _video(self, video_id):
+        rng = random.Random(_seed("video", video_id))
+        views = rng.randint(500, 500000)
+        likes = int(views * rng.uniform(0.005, 0.08))
+        comments = int(likes * rng.uniform(0.02, 0.2))
+        title = " ".join(rng.sample(WORDS, 4)).title()
+        published = datetime(2024, 1, 1) + timedelta(hours=rng.randint(0, 20000))
+
+        return {
+            "id": video_id,
+            "snippet": {
+                "title": title,
+                "description": f"{title} #{rng.choice(WORDS)}",
+                "publishedAt": published.strftime("%Y-%m-%dT%H:%M:%SZ"),
+                "channelTitle": video_id.split("-")[0],
+            },
+            "statistics": {
+                "viewCount": str(views),
+                "likeCount": str(likes),
+                "commentCount": str(comments),
+            },
+        }
+
+
+class ReplayYouTubeClient(FakeYouTubeClient):
+    """Serves responses recorded by RecordingYouTubeClient."""
+
+    def __init__(self, fixtures_path: str, **kwargs):
+        super().__init__(**kwargs)
+        with open(fixtures_path) as f:
+            self.fixtures = json.load(f)
+
+    def respond(self, endpoint: str, params: dict):
+        key = make_cache_key(endpoint, params)
+        if key not in self.fixtures:
+            raise _http_error(404, f"No recorded fixture for {key}")
+        return self.fixtures[key]
+
+
+class RecordingYouTubeClient:
+    """Wraps the live client and appends every response to a fixture file."""
+
+    _lock = threading.Lock()
+
+    def __init__(self, client, fixtures_path: str):
+        self._client = client
+        self.fixtures_path = fixtures_path
+
+    def __getattr__(self, name):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return lambda: _Resource(self, name)
+
+    def execute(self, endpoint: str, params: dict):
+        resource, method = endpoint.split(".")
+        response = getattr(
+            getattr(self._client, resource)(), method
+        )(**params).execute()
+
+        with self._lock:
+            fixtures = {}
+            if os.path.exists(self.fixtures_path):
+                with open(self.fixtures_path) as f:
+                    fixtures = json.load(f)
+            fixtures[make_cache_key(endpoint, params)] = response
+            with open(self.fixtures_path, "w") as f:
+                json.dump(fixtures, f)
+
+        return response
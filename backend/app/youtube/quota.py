@@ -0,0 +1,275 @@
+import contextvars
+import heapq
+import itertools
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from zoneinfo import ZoneInfo
+
+from sqlalchemy.dialects import postgresql, sqlite
+
+from app.config import (
+    YOUTUBE_DAILY_QUOTA,
+    YOUTUBE_QUOTA_BURST,
+    YOUTUBE_QUOTA_MAX_WAIT,
+    YOUTUBE_QUOTA_BACKGROUND_RESERVE,
+)
+from app.database import SessionLocal
+from app.models.analysis import QuotaUsage
+
+# Quota units charged by the YouTube Data API per call
+ENDPOINT_COSTS = {
+    "search.list": 100,
+    "videos.list": 1,
+    "channels.list": 1,
+    "playlistItems.list": 1,
+}
+DEFAULT_COST = 1
+
+INTERACTIVE = 0
+BACKGROUND = 1
+
+# Who is spending quota right now. Set by routes / jobs via quota_context.
+_current_user = contextvars.ContextVar("quota_user", default=None)
+_current_priority = contextvars.ContextVar("quota_priority", default=INTERACTIVE)
+
+
+class QuotaExhausted(Exception):
+    def __init__(self, retry_at: datetime):
+        self.retry_at = retry_at
+        super().__init__(
+            f"YouTube API quota exhausted, retry at {retry_at.isoformat()}"
+        )
+
+    @property
+    def retry_after(self) -> int:
+        """Seconds until retry_at, for the Retry-After header."""
+        delta = self.retry_at - datetime.now(timezone.utc)
+        return max(int(delta.total_seconds()), 1)
+
+
+PACIFIC = ZoneInfo("America/Los_Angeles")
+
+
+def quota_day() -> str:
+    """The current quota day; it starts at midnight Pacific time."""
+    return datetime.now(PACIFIC).date().isoformat()
+
+
+def next_quota_reset() -> datetime:
+    """YouTube resets the daily quota at midnight Pacific time."""
+    now = datetime.now(PACIFIC)
+    tomorrow = (now + timedelta(days=1)).replace(
+        hour=0, minute=0, second=0, microsecond=0
+    )
+    return tomorrow.astimezone(timezone.utc)
+
+
+@contextmanager
+def quota_context(user_id, priority: int = INTERACTIVE):
+    user_token = _current_user.set(user_id)
+    priority_token = _current_priority.set(priority)
+    try:
+        yield
+    finally:
+        _current_user.reset(user_token)
+        _current_priority.reset(priority_token)
+
+
+class DailyQuotaLedger:
+    """
+    Units spent on the API key today, kept in the database so every
+    worker process and restart counts against the same daily_quota.
+    """
+
+    def __init__(
+        self,
+        daily_quota: int = YOUTUBE_DAILY_QUOTA,
+        session_factory=SessionLocal
+    ):
+        self.daily_quota = daily_quota
+        self._session_factory = session_factory
+
+    def charge(self, cost: int) -> bool:
+        """Adds cost to today's total; False if that would exceed it."""
+        day = quota_day()
+        db = self._session_factory()
+        try:
+            insert = (
+                postgresql.insert if db.bind.dialect.name == "postgresql"
+                else sqlite.insert
+            )
+            db.execute(
+                insert(QuotaUsage)
+                .values(day=day, units=0)
+                .on_conflict_do_nothing(index_elements=["day"])
+            )
+            # Conditional increment: concurrent workers can't overshoot
+            charged = db.query(QuotaUsage).filter(
+                QuotaUsage.day == day,
+                QuotaUsage.units + cost <= self.daily_quota
+            ).update(
+                {QuotaUsage.units: QuotaUsage.units + cost},
+                synchronize_session=False
+            )
+            db.commit()
+            return charged == 1
+        finally:
+            db.close()
+
+    def spent_today(self) -> int:
+        db = self._session_factory()
+        try:
+            return db.query(QuotaUsage.units).filter(
+                QuotaUsage.day == quota_day()
+            ).scalar() or 0
+        finally:
+            db.close()
+
+
+class QuotaScheduler:
+    """
+    Token bucket in front of the YouTube client.
+
+    The bucket refills at daily_quota / 24h and holds at most `burst`
+    units, so spending is spread over the day. Callers that have to wait
+    are served interactive-first, then by whoever has spent the least,
+    so one heavy user can't starve the rest. Background work may not
+    dip into the last `background_reserve` units.
+
+    The bucket lives in this process and starts full, so each worker
+    (and each restart) gets its own burst. The day's total across all
+    of them is enforced by the optional DailyQuotaLedger.
+    """
+
+    def __init__(
+        self,
+        daily_quota: int = YOUTUBE_DAILY_QUOTA,
+        burst: int = YOUTUBE_QUOTA_BURST,
+        max_wait: float = YOUTUBE_QUOTA_MAX_WAIT,
+        background_reserve: int = YOUTUBE_QUOTA_BACKGROUND_RESERVE,
+        ledger: DailyQuotaLedger | None = None
+    ):
+        self.ledger = ledger
+        self.capacity = burst
+        self.rate = daily_quota / 86400
+        self.max_wait = max_wait
+        self.background_reserve = background_reserve
+
+        self.tokens = float(burst)
+        self.blocked_until = 0.0
+        self.spent_by_user = defaultdict(int)
+
+        self._updated = time.monotonic()
+        self._cond = threading.Condition()
+        self._queue = []
+        self._seq = itertools.count()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(
+            self.capacity, self.tokens + (now - self._updated) * self.rate
+        )
+        self._updated = now
+
+    def _available(self, priority: int) -> float:
+        if priority == BACKGROUND:
+            return self.tokens - self.background_reserve
+        return self.tokens
+
+    def _seconds_until(self, cost: int, priority: int) -> float:
+        now = time.monotonic()
+        if self.blocked_until > now:
+            return self.blocked_until - now
+        missing = cost - self._available(priority)
+        return max(missing, 0) / self.rate if self.rate else float("inf")
+
+    def _raise_exhausted(self, wait_seconds: float):
+        if self.blocked_until > time.monotonic():
+            raise QuotaExhausted(next_quota_reset())
+        retry_at = datetime.now(timezone.utc) + timedelta(seconds=wait_seconds)
+        raise QuotaExhausted(retry_at)
+
+    def acquire(self, endpoint: str):
+        cost = ENDPOINT_COSTS.get(endpoint, DEFAULT_COST)
+        user_id = _current_user.get()
+        priority = _current_priority.get()
+        deadline = time.monotonic() + self.max_wait
+
+        with self._cond:
+            self._refill()
+            wait_seconds = self._seconds_until(cost, priority)
+            if wait_seconds > self.max_wait:
+                self._raise_exhausted(wait_seconds)
+
+            entry = (
+                priority, self.spent_by_user[user_id], next(self._seq)
+            )
+            heapq.heappush(self._queue, entry)
+
+            try:
+                while True:
+                    self._refill()
+                    if (
+                        self._queue[0] == entry
+                        and self._seconds_until(cost, priority) == 0
+                    ):
+                        break
+
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._raise_exhausted(
+                            self._seconds_until(cost, priority)
+                        )
+                    self._cond.wait(timeout=min(remaining, 1.0))
+
+                self.tokens -= cost
+                self.spent_by_user[user_id] += cost
+            finally:
+                self._queue.remove(entry)
+                heapq.heapify(self._queue)
+                self._cond.notify_all()
+
+        if self.ledger is not None and not self._charge_ledger(cost):
+            self.mark_exhausted()
+            raise QuotaExhausted(next_quota_reset())
+
+    def _charge_ledger(self, cost: int) -> bool:
+        try:
+            return self.ledger.charge(cost)
+        except Exception as e:
+            # The bucket still limits this process if the DB is down
+            print("Could not record quota usage:", e)
+            return True
+
+    def mark_exhausted(self):
+        """The API itself reported quotaExceeded: stop until the reset."""
+        with self._cond:
+            reset_in = (
+                next_quota_reset() - datetime.now(timezone.utc)
+            ).total_seconds()
+            self.tokens = 0.0
+            self.blocked_until = time.monotonic() + reset_in
+            self._cond.notify_all()
+
+    def stats(self):
+        with self._cond:
+            self._refill()
+            stats = {
+                "tokens": round(self.tokens, 2),
+                "capacity": self.capacity,
+                "waiting": len(self._queue),
+                "spent_by_user": dict(self.spent_by_user),
+            }
+        if self.ledger is not None:
+            stats["spent_today"] = self.ledger.spent_today()
+        return stats
+
+
+_scheduler = QuotaScheduler(ledger=DailyQuotaLedger())
+
+
+def get_quota_scheduler():
+    return _scheduler
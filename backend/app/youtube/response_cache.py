@@ -0,0 +1,198 @@
+import json
+import sqlite3
+import threading
+import time
+
+from app.config import YOUTUBE_CACHE_PATH, YOUTUBE_CACHE_MAX_ENTRIES
+
+# How long a response stays fresh, per API endpoint (seconds).
+# Channel lookups barely change, stats and search results drift quickly.
+ENDPOINT_TTLS = {
+    "channels.list": 7 * 24 * 3600,
+    "search.list": 6 * 3600,
+    "playlistItems.list": 30 * 60,
+    "videos.list": 30 * 60,
+}
+DEFAULT_TTL = 30 * 60
+# Keys per IN (...) list, below SQLite's bound-parameter limit
+SQL_CHUNK = 500
+
+
+def make_cache_key(endpoint: str, params: dict) -> str:
+    return endpoint + ":" + json.dumps(params, sort_keys=True)
+
+
+class NullResponseCache:
+    """Cache that never stores anything (used when caching is disabled)."""
+
+    def get(self, endpoint: str, params: dict):
+        return None
+
+    def set(self, endpoint: str, params: dict, response: dict):
+        pass
+
+    def get_many(self, endpoint: str, params_list: list):
+        return [None] * len(params_list)
+
+    def set_many(self, endpoint: str, entries: list):
+        pass
+
+    def stats(self):
+        return {"hits": 0, "misses": 0, "entries": 0}
+
+
+class SQLiteResponseCache:
+    """
+    Disk-backed cache of raw YouTube API responses.
+
+    Entries expire after the TTL of their endpoint and the least recently
+    used entries are evicted once `max_entries` is exceeded.
+    """
+
+    def __init__(
+        self,
+        path: str = YOUTUBE_CACHE_PATH,
+        max_entries: int = YOUTUBE_CACHE_MAX_ENTRIES,
+        ttls: dict | None = None
+    ):
+        self.max_entries = max_entries
+        self.ttls = ttls or ENDPOINT_TTLS
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS api_responses (
+                cache_key TEXT PRIMARY KEY,
+                endpoint TEXT NOT NULL,
+                response TEXT NOT NULL,
+                expires_at REAL NOT NULL,
+                last_used REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS ix_api_responses_last_used "
+            "ON api_responses (last_used)"
+        )
+        self._conn.commit()
+
+    def get(self, endpoint: str, params: dict):
+        key = make_cache_key(endpoint, params)
+        now = time.time()
+
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT response, expires_at FROM api_responses "
+                "WHERE cache_key = ?",
+                (key,)
+            ).fetchone()
+
+            if row is None or row[1] < now:
+                self.misses += 1
+                return None
+
+            self._conn.execute(
+                "UPDATE api_responses SET last_used = ? WHERE cache_key = ?",
+                (now, key)
+            )
+            self._conn.commit()
+            self.hits += 1
+
+        return json.loads(row[0])
+
+    def get_many(self, endpoint: str, params_list: list):
+        """get() for many params in one transaction; None for misses."""
+        keys = [make_cache_key(endpoint, params) for params in params_list]
+        now = time.time()
+        found = {}
+
+        with self._lock:
+            for start in range(0, len(keys), SQL_CHUNK):
+                chunk = keys[start:start + SQL_CHUNK]
+                placeholders = ",".join("?" * len(chunk))
+                found.update(self._conn.execute(
+                    "SELECT cache_key, response FROM api_responses "
+                    f"WHERE cache_key IN ({placeholders}) "
+                    "AND expires_at >= ?",
+                    (*chunk, now)
+                ).fetchall())
+                self._conn.execute(
+                    "UPDATE api_responses SET last_used = ? "
+                    f"WHERE cache_key IN ({placeholders})",
+                    (now, *chunk)
+                )
+            self._conn.commit()
+            self.hits += len(found)
+            self.misses += len(keys) - len(found)
+
+        return [
+            json.loads(found[key]) if key in found else None
+            for key in keys
+        ]
+
+    def set(self, endpoint: str, params: dict, response: dict):
+        self.set_many(endpoint, [(params, response)])
+
+    def set_many(self, endpoint: str, entries: list):
+        """Stores (params, response) pairs in one transaction."""
+        now = time.time()
+        ttl = self.ttls.get(endpoint, DEFAULT_TTL)
+
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO api_responses "
+                "(cache_key, endpoint, response, expires_at, last_used) "
+                "VALUES (?, ?, ?, ?, ?)",
+                [
+                    (make_cache_key(endpoint, params), endpoint,
+                     json.dumps(response), now + ttl, now)
+                    for params, response in entries
+                ]
+            )
+            self._evict(now)
+            self._conn.commit()
+
+    def _evict(self, now: float):
+        self._conn.execute(
+            "DELETE FROM api_responses WHERE expires_at < ?", (now,)
+        )
+        count = self._conn.execute(
+            "SELECT COUNT(*) FROM api_responses"
+        ).fetchone()[0]
+
+        overflow = count - self.max_entries
+        if overflow > 0:
+            self._conn.execute(
+                "DELETE FROM api_responses WHERE cache_key IN ("
+                "SELECT cache_key FROM api_responses "
+                "ORDER BY last_used ASC LIMIT ?)",
+                (overflow,)
+            )
+
+    def stats(self):
+        with self._lock:
+            entries = self._conn.execute(
+                "SELECT COUNT(*) FROM api_responses"
+            ).fetchone()[0]
+        return {"hits": self.hits, "misses": self.misses, "entries": entries}
+
+
+_cache = None
+
+
+def get_response_cache():
+    global _cache
+    if _cache is None:
+        _cache = (
+            SQLiteResponseCache() if YOUTUBE_CACHE_PATH
+            else NullResponseCache()
+        )
+    return _cache
+
+
+def set_response_cache(cache):
+    """Swap the cache implementation (e.g. NullResponseCache in benchmarks)."""
+    global _cache
+    _cache = cache
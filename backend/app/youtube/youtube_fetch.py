@@ -1,45 +1,190 @@
 from googleapiclient.discovery import build
-from app.config import YOUTUBE_API_KEY
+from app.config import (
+    YOUTUBE_API_KEY,
+    YOUTUBE_BACKEND,
+    YOUTUBE_FIXTURES_PATH,
+    YOUTUBE_FAKE_LATENCY_MS,
+    YOUTUBE_FAKE_ERROR_RATE,
+    CHANNEL_FETCH_TIMEOUT,
+    CHANNEL_FETCH_WORKERS
+)
+from app.youtube.fake_client import (
+    SyntheticYouTubeClient,
+    ReplayYouTubeClient,
+    RecordingYouTubeClient
+)
+from app.youtube.response_cache import get_response_cache
+from app.youtube.quota import (
+    QuotaExhausted,
+    get_quota_scheduler,
+    next_quota_reset
+)
+from app.youtube.channel_index import (
+    parse_handle,
+    parse_channel_id,
+    lookup_handles,
+    store_handles
+)
 from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
-import re
+from concurrent.futures import ThreadPoolExecutor, wait
+import contextvars
+import threading
 
-youtube = build(
-    "youtube",
-    "v3",
-    developerKey=YOUTUBE_API_KEY
-)
+# videos.list / playlistItems.list accept at most 50 IDs / results per call
+MAX_PAGE_SIZE = 50
 
-def extract_channel_id(channel_url: str):
-    try:
-        # Handle @username URLs
-        match = re.search(r"youtube\.com/@([A-Za-z0-9_-]+)", channel_url)
-        if match:
-            handle = match.group(1)
+# googleapiclient clients share one httplib2 connection and are not
+# thread-safe, so every thread gets its own client.
+_local = threading.local()
 
-            response = youtube.channels().list(
-                part="id",
-                forHandle=handle
-            ).execute()
 
-            items = response.get("items", [])
-            if items:
-                return items[0]["id"]
+def _build_client():
+    fake_options = {
+        "latency_ms": YOUTUBE_FAKE_LATENCY_MS,
+        "error_rate": YOUTUBE_FAKE_ERROR_RATE,
+    }
 
-        # Handle direct channel ID URLs
-        match = re.search(r"youtube\.com/channel/([A-Za-z0-9_-]+)", channel_url)
-        if match:
-            return match.group(1)
+    if YOUTUBE_BACKEND == "synthetic":
+        return SyntheticYouTubeClient(**fake_options)
+    if YOUTUBE_BACKEND == "replay":
+        return ReplayYouTubeClient(YOUTUBE_FIXTURES_PATH, **fake_options)
 
-        return None
+    client = build(
+        "youtube",
+        "v3",
+        developerKey=YOUTUBE_API_KEY
+    )
+    if YOUTUBE_BACKEND == "record":
+        return RecordingYouTubeClient(client, YOUTUBE_FIXTURES_PATH)
+    return client
+
+
+def get_youtube_client():
+    client = getattr(_local, "youtube", None)
+    if client is None:
+        client = _build_client()
+        _local.youtube = client
+    return client
 
+
+def youtube_request(endpoint: str, **params):
+    """
+    Runs one API call, e.g. youtube_request("videos.list", id=...),
+    going through the response cache first and then the quota
+    scheduler. Raises QuotaExhausted instead of a raw HttpError when
+    the daily quota is used up.
+    """
+    cache = get_response_cache()
+    response = cache.get(endpoint, params)
+    if response is not None:
+        return response
+
+    response = _call_api(endpoint, **params)
+    cache.set(endpoint, params, response)
+    return response
+
+
+def _call_api(endpoint: str, **params):
+    """One API call through the quota scheduler, without the cache."""
+    scheduler = get_quota_scheduler()
+    scheduler.acquire(endpoint)
+
+    resource, method = endpoint.split(".")
+    client = get_youtube_client()
+    try:
+        response = getattr(
+            getattr(client, resource)(), method
+        )(**params).execute()
     except HttpError as e:
-        print("YouTube API error:", e)
-        return None
+        if e.resp.status == 403 and b"quotaExceeded" in (e.content or b""):
+            scheduler.mark_exhausted()
+            raise QuotaExhausted(next_quota_reset())
+        raise
+    return response
+
 
+class ChannelResolutionError(Exception):
+    pass
+
+
+def _fetch_handle_channel_id(handle: str):
+    """Channel ID of a handle from the API, None if YouTube has none."""
+    response = youtube_request("channels.list", part="id", forHandle=handle)
+    items = response.get("items", [])
+    return items[0]["id"] if items else None
+
+
+def _store_handles(resolved):
+    try:
+        store_handles(resolved)
     except Exception as e:
-        print("Unexpected error:", e)
-        return None
+        print("Could not update handle index:", e)
+
+
+def resolve_channel_ids(channel_urls):
+    """
+    Resolves a list of channel URLs to channel IDs in one go.
+
+    /channel/UC... URLs are parsed directly. @handle URLs are looked up
+    in the handle index with a single query and only unknown handles
+    hit the API. Returns ({channel_url: channel_id or None},
+    {channel_url: exception}): a None id means YouTube has no such
+    handle, while URLs that could not be resolved (unrecognized URL,
+    API error, QuotaExhausted) are in the errors dict instead.
+    """
+    handles = {}
+    for url in channel_urls:
+        handle = parse_handle(url)
+        if handle:
+            handles[url] = handle
+
+    known = lookup_handles(list(handles.values()))
+
+    resolved = {}
+    handle_errors = {}
+    for handle in set(handles.values()) - set(known):
+        try:
+            resolved[handle] = _fetch_handle_channel_id(handle)
+        except (HttpError, QuotaExhausted) as e:
+            # Don't remember transient failures as "unknown handle"
+            handle_errors[handle] = e
+
+    _store_handles(resolved)
+    known.update(resolved)
+
+    channel_ids = {}
+    errors = {}
+    for url in channel_urls:
+        if url in handles:
+            handle = handles[url]
+            if handle in handle_errors:
+                errors[url] = handle_errors[handle]
+            else:
+                channel_ids[url] = known.get(handle)
+        else:
+            channel_ids[url] = parse_channel_id(url)
+            if channel_ids[url] is None:
+                errors[url] = ChannelResolutionError(
+                    f"Unrecognized channel URL: {url}"
+                )
+    return channel_ids, errors
+
+
+def extract_channel_ids(channel_urls):
+    """{channel_url: channel_id or None}; see resolve_channel_ids."""
+    return resolve_channel_ids(channel_urls)[0]
+
+
+def extract_channel_id(channel_url: str):
+    """
+    Channel ID of one URL, None when YouTube has no such handle.
+    Raises when the URL could not be resolved.
+    """
+    channel_ids, errors = resolve_channel_ids([channel_url])
+    if channel_url in errors:
+        raise errors[channel_url]
+    return channel_ids[channel_url]
 
 
 # Initialize YouTube client once
@@ -76,82 +221,200 @@ def extract_channel_id(channel_url: str):
 #     return None
 
 
-def fetch_channel_videos(channel_url: str, max_results: int = 10):
+def build_video(item: dict) -> dict:
+    """Turns one videos.list item into our video dict."""
+    snippet = item["snippet"]
+    stats = item["statistics"]
+
+    views = int(stats.get("viewCount", 0))
+    likes = int(stats.get("likeCount", 0))
+    comments = int(stats.get("commentCount", 0))
+
+    engagement_rate = (
+        round((likes + comments) / views, 4)
+        if views > 0 else 0
+    )
+
+    return {
+        "video_id": item["id"],
+        "title": snippet["title"],
+        "description": snippet["description"],
+        "published_at": snippet["publishedAt"],
+        "views": views,
+        "likes": likes,
+        "comments": comments,
+        "engagement_rate": engagement_rate
+    }
+
+
+def _video_item_params(video_id: str) -> dict:
+    # Cache key of one videos.list item; "video_id" keeps it apart from
+    # whole responses of youtube_request("videos.list", id=...)
+    return {"part": "snippet,statistics", "video_id": video_id}
+
+
+def fetch_video_items(video_ids):
     """
-    Fetches recent videos + real metrics from a YouTube channel.
+    Fetches raw snippet + statistics items for any number of video IDs.
+
+    Items are cached per video, so a popular channel's videos hit the
+    cache whichever other channels they are fetched with. Only the
+    misses go to the API, MAX_PAGE_SIZE IDs per videos.list call.
+    Unknown / deleted videos are left out.
     """
+    video_ids = list(dict.fromkeys(video_ids))
+    cache = get_response_cache()
+    cached = cache.get_many(
+        "videos.list", [_video_item_params(v) for v in video_ids]
+    )
+    items = {
+        video_id: item
+        for video_id, item in zip(video_ids, cached)
+        if item is not None
+    }
+
+    misses = [v for v in video_ids if v not in items]
+    for start in range(0, len(misses), MAX_PAGE_SIZE):
+        video_response = _call_api(
+            "videos.list",
+            part="snippet,statistics",
+            id=",".join(misses[start:start + MAX_PAGE_SIZE])
+        )
+        fetched = video_response.get("items", [])
+        cache.set_many("videos.list", [
+            (_video_item_params(item["id"]), item) for item in fetched
+        ])
+        items.update((item["id"], item) for item in fetched)
 
-    channel_id = extract_channel_id(channel_url)
+    return [items[v] for v in video_ids if v in items]
 
-    if not channel_id:
-        return []
 
-    # Get recent video IDs
-    search_request = youtube.search().list(
-        part="id",
-        channelId=channel_id,
-        maxResults=max_results,
-        order="date"
-    )
-    search_response = search_request.execute()
+def fetch_video_stats(video_ids):
+    return [build_video(item) for item in fetch_video_items(video_ids)]
 
-    video_ids = [
-        item["id"]["videoId"]
-        for item in search_response["items"]
-        if item["id"]["kind"] == "youtube#video"
-    ]
 
-    if not video_ids:
-        return []
+class VideoStatsBatch:
+    """
+    Collects the video IDs of several channels (own channel and
+    competitors) and looks them all up with one fetch() in full 50-ID
+    videos.list calls, instead of one partly-filled call per channel.
+    Add every ID first, then fetch once.
+    """
+
+    def __init__(self):
+        self._ids = {}  # dict keeps insertion order and drops duplicates
+
+    def add(self, video_ids):
+        for video_id in video_ids:
+            self._ids.setdefault(video_id, None)
+
+    def __len__(self):
+        return len(self._ids)
 
-    # Fetch full stats for videos
-    video_request = youtube.videos().list(
-        part="snippet,statistics",
-        id=",".join(video_ids)
+    def fetch(self):
+        """Returns {video_id: videos.list item} for every added ID."""
+        return {
+            item["id"]: item
+            for item in fetch_video_items(list(self._ids))
+        }
+
+
+def get_uploads_playlist_id(channel_id: str):
+    response = youtube_request(
+        "channels.list",
+        part="contentDetails",
+        id=channel_id
     )
-    video_response = video_request.execute()
+    items = response.get("items", [])
+    if not items:
+        return None
+    return items[0]["contentDetails"]["relatedPlaylists"]["uploads"]
+
+
+def iter_upload_ids(channel_id: str, limit: int | None = None):
+    """
+    Yields pages of video IDs from the channel's uploads playlist,
+    newest first, following page tokens until `limit` IDs were seen.
+    playlistItems.list costs 1 unit per page vs 100 for search.list.
+    """
+    playlist_id = get_uploads_playlist_id(channel_id)
+    if not playlist_id:
+        return
+
+    seen = 0
+    page_token = None
+    while limit is None or seen < limit:
+        params = {
+            "part": "contentDetails",
+            "playlistId": playlist_id,
+            "maxResults": MAX_PAGE_SIZE,
+        }
+        if page_token:
+            params["pageToken"] = page_token
+
+        response = youtube_request("playlistItems.list", **params)
+
+        video_ids = [
+            item["contentDetails"]["videoId"]
+            for item in response.get("items", [])
+        ]
+        if limit is not None:
+            video_ids = video_ids[:limit - seen]
+        seen += len(video_ids)
+
+        if video_ids:
+            yield video_ids
+
+        page_token = response.get("nextPageToken")
+        if not page_token:
+            break
+
+
+def list_channel_video_ids(channel_id: str, limit: int | None = None):
+    video_ids = []
+    for page in iter_upload_ids(channel_id, limit=limit):
+        video_ids.extend(page)
+    return video_ids
+
+
+def iter_channel_videos(channel_id: str, limit: int | None = None):
+    """
+    Generator over the channel's videos with stats, newest first.
+    Only one page (50 videos) is held in memory at a time.
+    """
+    for video_ids in iter_upload_ids(channel_id, limit=limit):
+        yield from fetch_video_stats(video_ids)
 
-    videos = []
 
-    for item in video_response["items"]:
-        snippet = item["snippet"]
-        stats = item["statistics"]
+def fetch_channel_videos(
+    channel_url: str,
+    max_results: int = 10,
+    channel_id: str | None = None
+):
+    """
+    Fetches recent videos + real metrics from a YouTube channel.
+    Pass channel_id when the URL was already resolved.
+    """
 
-        views = int(stats.get("viewCount", 0))
-        likes = int(stats.get("likeCount", 0))
-        comments = int(stats.get("commentCount", 0))
+    if channel_id is None:
+        channel_id = extract_channel_id(channel_url)
 
-        engagement_rate = (
-            round((likes + comments) / views, 4)
-            if views > 0 else 0
-        )
+    if not channel_id:
+        return []
 
-        videos.append({
-            "video_id": item["id"],
-            "title": snippet["title"],
-            "description": snippet["description"],
-            "published_at": snippet["publishedAt"],
-            "views": views,
-            "likes": likes,
-            "comments": comments,
-            "engagement_rate": engagement_rate
-        })
-
-    return videos
+    return list(iter_channel_videos(channel_id, limit=max_results))
 
 
-def fetch_trending_videos_by_query(
+def search_trending_video_ids(
     query: str,
     max_results: int = 6,
     region_code: str = "US"
 ):
-    """
-    Fetch trending videos by query (niche keywords) using YouTube search.
-    """
     if not query:
         return []
 
-    search_request = youtube.search().list(
+    search_response = youtube_request(
+        "search.list",
         part="id",
         q=query,
         maxResults=max_results,
@@ -160,33 +423,173 @@ def fetch_trending_videos_by_query(
         type="video",
         safeSearch="none"
     )
-    search_response = search_request.execute()
 
-    video_ids = [
+    return [
         item["id"]["videoId"]
         for item in search_response.get("items", [])
         if item.get("id", {}).get("videoId")
     ]
 
+
+def build_trending_video(item: dict) -> dict:
+    snippet = item.get("snippet", {})
+    stats = item.get("statistics", {})
+
+    return {
+        "title": snippet.get("title"),
+        "channel": snippet.get("channelTitle"),
+        "published_at": snippet.get("publishedAt"),
+        "views": int(stats.get("viewCount", 0))
+    }
+
+
+def fetch_trending_videos_by_query(
+    query: str,
+    max_results: int = 6,
+    region_code: str = "US"
+):
+    """
+    Fetch trending videos by query (niche keywords) using YouTube search.
+    """
+    video_ids = search_trending_video_ids(query, max_results, region_code)
+
     if not video_ids:
         return []
 
-    video_request = youtube.videos().list(
-        part="snippet,statistics",
-        id=",".join(video_ids)
-    )
-    video_response = video_request.execute()
-
-    videos = []
-    for item in video_response.get("items", []):
-        snippet = item.get("snippet", {})
-        stats = item.get("statistics", {})
-
-        videos.append({
-            "title": snippet.get("title"),
-            "channel": snippet.get("channelTitle"),
-            "published_at": snippet.get("publishedAt"),
-            "views": int(stats.get("viewCount", 0))
-        })
-
-    return videos
+    return [
+        build_trending_video(item) for item in fetch_video_items(video_ids)
+    ]
+
+
+def list_channels_concurrently(
+    channel_requests,
+    timeout: float = CHANNEL_FETCH_TIMEOUT,
+    max_workers: int = CHANNEL_FETCH_WORKERS
+):
+    """
+    Lists the newest upload IDs of several channels at once.
+
+    channel_requests is a list of (channel_url, max_results) tuples.
+    Returns one dict per request, in the same order:
+    {"channel_url", "video_ids", "error", "quota_error"} where error is
+    None on success and quota_error holds the QuotaExhausted exception
+    when the quota ran out.
+    A channel that does not finish within `timeout` seconds is reported
+    as failed instead of holding up the others.
+    """
+    if not channel_requests:
+        return []
+
+    # One handle index query for every channel; handles it doesn't know
+    # are resolved by their channel's worker, in parallel and under the
+    # same deadline as the listing itself
+    handles = {url: parse_handle(url) for url, _ in channel_requests}
+    known = lookup_handles([h for h in handles.values() if h])
+
+    def list_channel(url, max_results):
+        handle = handles[url]
+        if not handle:
+            channel_id = parse_channel_id(url)
+        elif handle in known:
+            channel_id = known[handle]
+        else:
+            # API errors propagate: a failure is not an unknown handle
+            channel_id = _fetch_handle_channel_id(handle)
+            _store_handles({handle: channel_id})
+
+        if not channel_id:
+            return []  # YouTube has no such handle, same as no videos
+        return list_channel_video_ids(channel_id, limit=max_results)
+
+    executor = ThreadPoolExecutor(
+        max_workers=min(max_workers, len(channel_requests))
+    )
+    # Each worker runs in a copy of the caller's context so quota is
+    # charged to the right user and priority.
+    futures = [
+        executor.submit(
+            contextvars.copy_context().run, list_channel, url, max_results
+        ) if handles[url] or parse_channel_id(url) else None
+        for url, max_results in channel_requests
+    ]
+
+    # All channels run in parallel, so one shared deadline is the
+    # per-channel timeout.
+    wait([f for f in futures if f], timeout=timeout)
+    executor.shutdown(wait=False, cancel_futures=True)
+
+    results = []
+    for (url, _), future in zip(channel_requests, futures):
+        result = {
+            "channel_url": url,
+            "video_ids": [],
+            "error": None,
+            "quota_error": None
+        }
+
+        if future is None:
+            result["error"] = f"Unrecognized channel URL: {url}"
+        elif not future.done():
+            future.cancel()
+            result["error"] = f"Timed out after {timeout}s"
+        elif future.exception() is not None:
+            result["error"] = str(future.exception())
+            if isinstance(future.exception(), QuotaExhausted):
+                result["quota_error"] = future.exception()
+        else:
+            result["video_ids"] = future.result()
+
+        results.append(result)
+
+    return results
+
+
+def fetch_channels_concurrently(
+    channel_requests,
+    timeout: float = CHANNEL_FETCH_TIMEOUT,
+    max_workers: int = CHANNEL_FETCH_WORKERS
+):
+    """
+    Fetches several channels at once.
+
+    Same arguments and result shape as list_channels_concurrently, with
+    "videos" (video dicts with stats) in place of "video_ids". Upload
+    lists are walked in parallel first; the stats of every channel's
+    videos are then fetched together through one VideoStatsBatch.
+    """
+    listings = list_channels_concurrently(
+        channel_requests, timeout=timeout, max_workers=max_workers
+    )
+
+    batch = VideoStatsBatch()
+    for listing in listings:
+        batch.add(listing["video_ids"])
+
+    results = [
+        {
+            "channel_url": listing["channel_url"],
+            "videos": [],
+            "error": listing["error"],
+            "quota_error": listing["quota_error"]
+        }
+        for listing in listings
+    ]
+
+    try:
+        items = batch.fetch() if len(batch) else {}
+    except Exception as e:
+        for result, listing in zip(results, listings):
+            if listing["video_ids"]:
+                result["error"] = str(e)
+                if isinstance(e, QuotaExhausted):
+                    result["quota_error"] = e
+        return results
+
+    for result, listing in zip(results, listings):
+        result["videos"] = [
+            build_video(items[video_id])
+            for video_id in listing["video_ids"]
+            if video_id in items
+        ]
+
+    return results
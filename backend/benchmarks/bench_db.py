@@ -0,0 +1,122 @@
+"""
+Mixed analyze / dashboard traffic against the configured database:
+writer threads ingest full runs while reader threads load dashboards.
+Prints write throughput and dashboard read latency.
+
+Run from backend/:
+    python -m benchmarks.bench_db
+    DATABASE_URL=postgresql+psycopg2://user:pw@localhost/bench \\
+        python -m benchmarks.bench_db
+"""
+import os
+import random
+import statistics
+import threading
+import time
+
+# Must be set before app.config is imported
+os.environ.setdefault("DATABASE_URL", "sqlite:///./bench_db.sqlite")
+
+from app.database import Base, SessionLocal, engine  # noqa: E402
+from app.models.analysis import AnalysisRun  # noqa: E402
+from app.models.user import User  # noqa: E402, F401
+from app.services.analysis_history import history_page  # noqa: E402
+from app.services.analysis_summary import (  # noqa: E402
+    get_summary,
+    engagement_trend
+)
+from app.services.ingestion import ingest_run  # noqa: E402
+
+WRITERS = 4
+READERS = 16
+DURATION = 10
+VIDEOS_PER_RUN = 300
+USERS = 20
+
+
+def fake_videos(count):
+    videos = []
+    for i in range(count):
+        views = random.randint(500, 500000)
+        likes = int(views * random.uniform(0.005, 0.08))
+        comments = int(likes * random.uniform(0.02, 0.2))
+        videos.append({
+            "video_id": f"bench-{i}",
+            "title": f"Bench video {i} budget travel tips",
+            "views": views,
+            "likes": likes,
+            "comments": comments,
+            "engagement_rate": (likes + comments) / views,
+        })
+    return videos
+
+
+def writer(stop, results):
+    while not stop.is_set():
+        db = SessionLocal()
+        try:
+            analysis = AnalysisRun(
+                user_id=random.randint(1, USERS),
+                channel_url="https://www.youtube.com/@bench"
+            )
+            stats = ingest_run(
+                db, analysis,
+                fake_videos(VIDEOS_PER_RUN // 2),
+                fake_videos(VIDEOS_PER_RUN // 2)
+            )
+            results.append(stats["rows"])
+        finally:
+            db.close()
+
+
+def reader(stop, latencies):
+    while not stop.is_set():
+        user_id = random.randint(1, USERS)
+        start = time.perf_counter()
+        db = SessionLocal()
+        try:
+            page = history_page(db, user_id, limit=1)
+            if page["items"]:
+                get_summary(db, page["items"][0]["id"])
+            engagement_trend(db, user_id)
+        finally:
+            db.close()
+        latencies.append(time.perf_counter() - start)
+
+
+def run(threads, target, stop, sink):
+    return [
+        threading.Thread(target=target, args=(stop, sink), daemon=True)
+        for _ in range(threads)
+    ]
+
+
+if __name__ == "__main__":
+    Base.metadata.create_all(bind=engine)
+    print(
+        f"url={engine.url.render_as_string(hide_password=True)} "
+        f"writers={WRITERS} readers={READERS} duration={DURATION}s"
+    )
+
+    stop = threading.Event()
+    written, latencies = [], []
+    threads = (
+        run(WRITERS, writer, stop, written)
+        + run(READERS, reader, stop, latencies)
+    )
+    for thread in threads:
+        thread.start()
+    time.sleep(DURATION)
+    stop.set()
+    for thread in threads:
+        thread.join()
+
+    latencies.sort()
+    print(f"runs written        {len(written)}")
+    print(f"rows/sec written    {sum(written) / DURATION:10.1f}")
+    print(f"dashboard reads     {len(latencies)}")
+    if latencies:
+        p50 = statistics.median(latencies)
+        p95 = latencies[int(len(latencies) * 0.95) - 1]
+        print(f"read p50            {p50 * 1000:8.1f} ms")
+        print(f"read p95            {p95 * 1000:8.1f} ms")
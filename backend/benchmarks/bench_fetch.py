@@ -0,0 +1,71 @@
+"""
+Times the YouTube fetch paths against the offline synthetic backend.
+
+Channel handles are resolved into a throwaway SQLite database, so the
+committed users.db is never touched.
+
+Run from backend/:
+    python -m benchmarks.bench_fetch
+    YOUTUBE_FAKE_LATENCY_MS=80 python -m benchmarks.bench_fetch
+"""
+import os
+import shutil
+import tempfile
+import time
+
+# Must be set before app.config is imported
+DB_DIR = tempfile.mkdtemp(prefix="bench_fetch-")
+os.environ.setdefault(
+    "DATABASE_URL", f"sqlite:///{os.path.join(DB_DIR, 'bench.sqlite')}"
+)
+os.environ.setdefault("YOUTUBE_BACKEND", "synthetic")
+os.environ.setdefault("YOUTUBE_CACHE_PATH", "")
+
+from app.database import Base, engine  # noqa: E402
+from app.models import analysis, user  # noqa: E402, F401
+from app.youtube.youtube_fetch import (  # noqa: E402
+    fetch_channel_videos,
+    fetch_channels_concurrently,
+    fetch_trending_videos_by_query,
+)
+
+CHANNELS = [f"https://www.youtube.com/@bench_channel_{i}" for i in range(6)]
+ROUNDS = 5
+
+
+def timed(label, fn):
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        fn()
+    elapsed = (time.perf_counter() - start) / ROUNDS
+    print(f"{label:<40} {elapsed * 1000:8.1f} ms/round")
+
+
+def run():
+    print(f"backend={os.environ['YOUTUBE_BACKEND']} rounds={ROUNDS}")
+
+    timed(
+        "sequential 6 channels x 10 videos",
+        lambda: [fetch_channel_videos(url, max_results=10) for url in CHANNELS]
+    )
+    timed(
+        "concurrent 6 channels x 10 videos",
+        lambda: fetch_channels_concurrently([(url, 10) for url in CHANNELS])
+    )
+    timed(
+        "concurrent 6 channels x 200 videos",
+        lambda: fetch_channels_concurrently([(url, 200) for url in CHANNELS])
+    )
+    timed(
+        "trending query",
+        lambda: fetch_trending_videos_by_query("python coding tips")
+    )
+
+
+if __name__ == "__main__":
+    Base.metadata.create_all(bind=engine)
+    try:
+        run()
+    finally:
+        engine.dispose()
+        shutil.rmtree(DB_DIR, ignore_errors=True)
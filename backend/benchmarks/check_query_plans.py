@@ -0,0 +1,96 @@
+"""
+Checks that the hot dashboard / history / insights queries are served
+by the composite indexes (no full scans, no temp sort trees).
+
+Run from backend/:
+    python -m benchmarks.check_query_plans
+"""
+from datetime import datetime
+
+from sqlalchemy import create_engine, or_
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base
+from app.models.analysis import AnalysisRun
+from app.services.analysis_summary import engagement_trend_query
+from app.services.title_terms import top_terms_query
+from app.services.video_snapshots import snapshots_query
+from app.services.video_stats import video_columns_query
+from app.utils.query_plan import assert_uses_index, explain_query_plan
+
+VIDEO_INDEX = "ix_videos_analysis_source_engagement"
+TITLE_TERM_INDEX = "ix_title_terms_analysis_source_score"
+SNAPSHOT_INDEX = "sqlite_autoindex_video_snapshots_1"  # primary key
+RUN_INDEX = "ix_analysis_runs_user_analyzed"
+RUN_CHANNEL_INDEX = "ix_analysis_runs_user_channel_analyzed"
+
+
+def hot_queries(db):
+    """(label, index, covering, query) of the queries behind each page."""
+    yield "video columns of a run", VIDEO_INDEX, False, (
+        video_columns_query(db, 1)
+    )
+    yield "top title terms", TITLE_TERM_INDEX, False, (
+        top_terms_query(db, 1, "own")
+    )
+    yield "engagement trend", RUN_INDEX, False, (
+        engagement_trend_query(db, 1)
+    )
+    yield "snapshots for own velocity", SNAPSHOT_INDEX, False, (
+        snapshots_query(db, ["a", "b", "c"])
+    )
+    yield "history", RUN_INDEX, False, (
+        db.query(
+            AnalysisRun.id, AnalysisRun.channel_url, AnalysisRun.analyzed_at
+        )
+        .filter(AnalysisRun.user_id == 1)
+        .order_by(AnalysisRun.analyzed_at.desc(), AnalysisRun.id.desc())
+        .limit(21)
+    )
+    yield "history page after cursor", RUN_INDEX, False, (
+        db.query(
+            AnalysisRun.id, AnalysisRun.channel_url, AnalysisRun.analyzed_at
+        )
+        .filter(
+            AnalysisRun.user_id == 1,
+            AnalysisRun.analyzed_at <= datetime.utcnow(),
+            or_(
+                AnalysisRun.analyzed_at < datetime.utcnow(),
+                AnalysisRun.id < 100
+            )
+        )
+        .order_by(AnalysisRun.analyzed_at.desc(), AnalysisRun.id.desc())
+        .limit(21)
+    )
+    yield "previous run", RUN_INDEX, True, (
+        db.query(AnalysisRun.id)
+        .filter(
+            AnalysisRun.user_id == 1,
+            AnalysisRun.analyzed_at < datetime.utcnow()
+        )
+        .order_by(AnalysisRun.analyzed_at.desc())
+        .limit(1)
+    )
+    yield "previous run of channel", RUN_CHANNEL_INDEX, False, (
+        db.query(AnalysisRun)
+        .filter(
+            AnalysisRun.user_id == 1,
+            AnalysisRun.channel_url == "https://www.youtube.com/@x"
+        )
+        .order_by(AnalysisRun.analyzed_at.desc())
+        .limit(1)
+    )
+
+
+if __name__ == "__main__":
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+
+    for label, index_name, covering, query in hot_queries(db):
+        print(f"{label}:")
+        for line in explain_query_plan(db, query):
+            print("   ", line)
+        assert_uses_index(db, query, index_name, covering=covering)
+
+    print("✅ All hot queries use their indexes")
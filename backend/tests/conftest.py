@@ -0,0 +1,34 @@
+import os
+import tempfile
+
+import pytest
+
+# Must be set before app.config is imported: never touch users.db or
+# the real YouTube API from tests
+DB_DIR = tempfile.mkdtemp(prefix="yt-analyzer-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(DB_DIR, 'test.sqlite')}"
+os.environ["YOUTUBE_BACKEND"] = "synthetic"
+os.environ["YOUTUBE_CACHE_PATH"] = ""
+
+from app.database import Base, SessionLocal, engine  # noqa: E402
+from app.models import analysis, user  # noqa: E402, F401
+
+Base.metadata.create_all(bind=engine)
+
+
+def _clear_tables():
+    with engine.begin() as connection:
+        for table in reversed(Base.metadata.sorted_tables):
+            connection.execute(table.delete())
+
+
+@pytest.fixture
+def db():
+    # Tests without this fixture may still write, e.g. quota usage
+    _clear_tables()
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+        _clear_tables()
@@ -0,0 +1,63 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.models.analysis import AnalysisRun
+from app.services.analysis_history import (
+    InvalidCursor,
+    decode_cursor,
+    encode_cursor,
+    history_page
+)
+
+
+def add_runs(db, user_id, times):
+    runs = [
+        AnalysisRun(
+            user_id=user_id,
+            channel_url=f"https://www.youtube.com/@c{i}",
+            analyzed_at=analyzed_at
+        )
+        for i, analyzed_at in enumerate(times)
+    ]
+    db.add_all(runs)
+    db.commit()
+    return runs
+
+
+def test_cursor_round_trip():
+    analyzed_at = datetime(2026, 3, 1, 12, 30, 15, 123456)
+    assert decode_cursor(encode_cursor(analyzed_at, 42)) == (analyzed_at, 42)
+
+
+@pytest.mark.parametrize("cursor", ["not base64!", "", "bm9waXBl"])
+def test_invalid_cursor(cursor):
+    with pytest.raises(InvalidCursor):
+        decode_cursor(cursor)
+
+
+def test_pages_cover_every_run_once_newest_first(db):
+    start = datetime(2026, 1, 1)
+    # Runs sharing a timestamp are ordered by id
+    times = [start + timedelta(hours=i // 2) for i in range(7)]
+    runs = add_runs(db, 1, times)
+    add_runs(db, 2, [start])
+
+    seen, cursor = [], None
+    while True:
+        page = history_page(db, 1, cursor=cursor, limit=3)
+        seen.extend(item["id"] for item in page["items"])
+        if not page["has_more"]:
+            assert page["next_cursor"] is None
+            break
+        cursor = page["next_cursor"]
+
+    expected = sorted(
+        runs, key=lambda r: (r.analyzed_at, r.id), reverse=True
+    )
+    assert seen == [r.id for r in expected]
+
+
+def test_empty_history(db):
+    page = history_page(db, 1)
+    assert page == {"items": [], "has_more": False, "next_cursor": None}
@@ -0,0 +1,42 @@
+from datetime import datetime
+
+from app.models.analysis import AnalysisJob, AnalysisRun
+from app.services.analysis_jobs import run_job
+from app.youtube import youtube_fetch
+from app.youtube.quota import QuotaScheduler
+
+
+def test_quota_failure_records_retry_at(db, monkeypatch):
+    exhausted = QuotaScheduler()
+    exhausted.mark_exhausted()
+    monkeypatch.setattr(
+        youtube_fetch, "get_quota_scheduler", lambda: exhausted
+    )
+
+    run = AnalysisRun(
+        user_id=1, channel_url="https://www.youtube.com/channel/UCown"
+    )
+    db.add(run)
+    db.flush()
+    job = AnalysisJob(
+        analysis_id=run.id,
+        user_id=1,
+        params={
+            "channel_url": run.channel_url,
+            "competitor_urls": [],
+            "own_max_results": 5,
+            "competitor_max_results": 5,
+        }
+    )
+    db.add(job)
+    db.commit()
+
+    run_job(job.id)
+
+    db.expire_all()
+    job = db.get(AnalysisJob, job.id)
+    assert job.status == "failed"
+    assert "quota exhausted" in job.error
+    assert job.retry_at > datetime.utcnow()
+    # The new run never got videos, so it is discarded
+    assert job.analysis_id is None
@@ -0,0 +1,65 @@
+import threading
+import time
+
+from app.youtube import youtube_fetch
+from app.youtube.channel_index import lookup_handles
+
+
+def test_new_handles_resolve_in_parallel(db, monkeypatch):
+    fetch_handle = youtube_fetch._fetch_handle_channel_id
+    running, peak = [0], [0]
+    lock = threading.Lock()
+
+    def slow_fetch_handle(handle):
+        with lock:
+            running[0] += 1
+            peak[0] = max(peak[0], running[0])
+        time.sleep(0.2)
+        with lock:
+            running[0] -= 1
+        return fetch_handle(handle)
+
+    monkeypatch.setattr(
+        youtube_fetch, "_fetch_handle_channel_id", slow_fetch_handle
+    )
+    urls = [f"https://www.youtube.com/@new_channel_{i}" for i in range(4)]
+
+    results = youtube_fetch.list_channels_concurrently(
+        [(url, 5) for url in urls], max_workers=4
+    )
+
+    assert peak[0] == 4
+    assert all(r["error"] is None and r["video_ids"] for r in results)
+    # Remembered for the next analysis
+    assert len(lookup_handles([f"new_channel_{i}" for i in range(4)])) == 4
+
+
+def test_hung_handle_lookup_times_out_alone(db, monkeypatch):
+    fetch_handle = youtube_fetch._fetch_handle_channel_id
+    release = threading.Event()
+
+    def hanging_fetch_handle(handle):
+        if handle == "slow":
+            release.wait(5)
+        return fetch_handle(handle)
+
+    monkeypatch.setattr(
+        youtube_fetch, "_fetch_handle_channel_id", hanging_fetch_handle
+    )
+    start = time.monotonic()
+    try:
+        slow, fast, bad = youtube_fetch.list_channels_concurrently(
+            [
+                ("https://www.youtube.com/@slow", 5),
+                ("https://www.youtube.com/@fast", 5),
+                ("https://example.com/not-a-channel", 5),
+            ],
+            timeout=0.5
+        )
+    finally:
+        release.set()
+
+    assert time.monotonic() - start < 2
+    assert slow["error"].startswith("Timed out")
+    assert fast["error"] is None and fast["video_ids"]
+    assert bad["error"] == "Unrecognized channel URL: " + bad["channel_url"]
@@ -0,0 +1,17 @@
+import pytest
+
+from app.database import to_async_url
+
+
+def test_async_url_uses_asyncio_driver():
+    assert to_async_url("sqlite:///./users.db") == (
+        "sqlite+aiosqlite:///./users.db"
+    )
+    assert to_async_url("postgresql+psycopg2://u:pw@db/app") == (
+        "postgresql+asyncpg://u:pw@db/app"
+    )
+
+
+def test_unknown_dialect_points_to_async_database_url():
+    with pytest.raises(ValueError, match="ASYNC_DATABASE_URL"):
+        to_async_url("mysql+pymysql://u:pw@db/app")
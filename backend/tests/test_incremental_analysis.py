@@ -0,0 +1,81 @@
+from app.models.analysis import AnalysisRun, AnalysisSummary, Video
+from app.services import incremental_analysis
+from app.services.incremental_analysis import refresh_run
+
+
+def add_run(db, videos):
+    run = AnalysisRun(user_id=1, channel_url="https://www.youtube.com/@own")
+    db.add(run)
+    db.flush()
+    db.add_all([
+        Video(
+            analysis_id=run.id, video_id=video_id, source=source,
+            title="stored", views=1, likes=0, comments=0,
+            engagement_rate=0
+        )
+        for source, video_id in videos
+    ])
+    db.commit()
+    return run
+
+
+def listing(url, video_ids, error=None):
+    return {
+        "channel_url": url, "video_ids": video_ids,
+        "error": error, "quota_error": None,
+    }
+
+
+def stored(db, run):
+    return {
+        (v.source, v.video_id): v.title
+        for v in db.query(Video).filter(Video.analysis_id == run.id)
+    }
+
+
+def test_refresh_inserts_updates_and_removes(db, monkeypatch):
+    monkeypatch.setattr(incremental_analysis, "REFRESH_RECENT_VIDEOS", 2)
+    run = add_run(db, [
+        ("own", "UUown-1"), ("own", "UUown-2"), ("own", "UUown-gone"),
+        ("competitor", "UUrival-1"), ("competitor", "UUrival-gone"),
+    ])
+
+    result = refresh_run(
+        db, run,
+        ["UUown-new", "UUown-1", "UUown-2"],
+        [listing("https://www.youtube.com/@rival", ["UUrival-1"])]
+    )
+
+    assert result["new_videos"] == 1  # UUown-new
+    assert result["refreshed_videos"] == 2  # UUown-1, UUrival-1
+    assert result["removed_videos"] == 2
+    assert result["unchanged_videos"] == 1  # UUown-2, not recent
+    assert result["failed_competitors"] == []
+
+    videos = stored(db, run)
+    assert set(videos) == {
+        ("own", "UUown-new"), ("own", "UUown-1"), ("own", "UUown-2"),
+        ("competitor", "UUrival-1"),
+    }
+    assert videos[("own", "UUown-2")] == "stored"
+    assert videos[("own", "UUown-1")] != "stored"
+
+    summary = db.get(AnalysisSummary, run.id)
+    assert summary.own_total_videos == 3
+
+
+def test_failed_competitor_keeps_its_rows(db):
+    run = add_run(db, [("own", "UUown-1"), ("competitor", "UUrival-1")])
+
+    result = refresh_run(
+        db, run,
+        ["UUown-1"],
+        [listing("https://www.youtube.com/@rival", [], error="Timed out")]
+    )
+
+    assert result["removed_videos"] == 0
+    assert result["failed_competitors"] == [{
+        "channel_url": "https://www.youtube.com/@rival",
+        "error": "Timed out",
+    }]
+    assert ("competitor", "UUrival-1") in stored(db, run)
@@ -0,0 +1,36 @@
+from app.models.analysis import AnalysisRun
+from app.services.incremental_analysis import refresh_run
+from app.services.insights_cache import InsightsCache, insights_cache
+
+
+def test_invalidate_analysis_drops_only_that_run():
+    cache = InsightsCache()
+    cache.put((1, None, "Grow"), 7, {"analysis_id": 1})
+    cache.put((1, None, "Sell"), 7, {"analysis_id": 1})
+    cache.put((2, 1, "Grow"), 7, {"analysis_id": 2})
+
+    cache.invalidate_analysis(1)
+
+    assert cache.get((1, None, "Grow")) is None
+    assert cache.get((2, 1, "Grow")) == {"analysis_id": 2}
+    assert cache.stats() == {
+        "entries": 1, "hits": 1, "misses": 1, "hit_rate": 0.5,
+    }
+
+
+def test_refresh_invalidates_the_refreshed_run(db):
+    runs = [
+        AnalysisRun(user_id=1, channel_url="https://www.youtube.com/@own")
+        for _ in range(2)
+    ]
+    db.add_all(runs)
+    db.commit()
+    refreshed, other = runs
+    insights_cache.put((refreshed.id, None, "Grow"), 1, {})
+    insights_cache.put((other.id, refreshed.id, "Grow"), 1, {})
+
+    refresh_run(db, refreshed, ["UUown-1"], [])
+
+    assert insights_cache.get((refreshed.id, None, "Grow")) is None
+    assert insights_cache.get((other.id, refreshed.id, "Grow")) == {}
+    insights_cache.invalidate_user(1)
@@ -0,0 +1,24 @@
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base
+from app.utils.query_plan import assert_uses_index
+from benchmarks.check_query_plans import hot_queries
+
+
+@pytest.fixture(scope="module")
+def memory_db():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+
+
+def test_hot_queries_use_their_indexes(memory_db):
+    checked = 0
+    for label, index_name, covering, query in hot_queries(memory_db):
+        assert_uses_index(memory_db, query, index_name, covering=covering)
+        checked += 1
+    assert checked
@@ -0,0 +1,81 @@
+import pytest
+
+from app.youtube.quota import (
+    BACKGROUND,
+    DailyQuotaLedger,
+    QuotaExhausted,
+    QuotaScheduler,
+    quota_context
+)
+
+
+def scheduler(**kwargs):
+    # No refill during a test: 1 unit per day is effectively 0
+    options = {
+        "daily_quota": 1, "burst": 200, "max_wait": 0,
+        "background_reserve": 0,
+    }
+    options.update(kwargs)
+    return QuotaScheduler(**options)
+
+
+def test_acquire_charges_endpoint_cost_to_current_user():
+    quota = scheduler()
+    with quota_context(7):
+        quota.acquire("search.list")
+        quota.acquire("videos.list")
+
+    stats = quota.stats()
+    assert stats["spent_by_user"] == {7: 101}
+    assert stats["tokens"] == pytest.approx(99, abs=0.1)
+
+
+def test_acquire_raises_when_bucket_cannot_refill_in_time():
+    quota = scheduler(burst=150)
+    quota.acquire("search.list")
+
+    with pytest.raises(QuotaExhausted) as exc:
+        quota.acquire("search.list")
+    assert exc.value.retry_after >= 1
+
+
+def test_background_work_leaves_the_reserve():
+    quota = scheduler(burst=150, background_reserve=100)
+
+    with quota_context(1, priority=BACKGROUND):
+        with pytest.raises(QuotaExhausted):
+            quota.acquire("search.list")
+        quota.acquire("videos.list")
+
+    # Interactive calls may use the reserve
+    with quota_context(2):
+        quota.acquire("search.list")
+
+
+def test_mark_exhausted_blocks_until_reset():
+    quota = scheduler()
+    quota.mark_exhausted()
+
+    with pytest.raises(QuotaExhausted):
+        quota.acquire("videos.list")
+    assert quota.stats()["tokens"] == pytest.approx(0, abs=0.1)
+
+
+def test_ledger_caps_the_day_across_workers(db):
+    ledger = DailyQuotaLedger(daily_quota=250)
+    # Two processes, each with its own full bucket
+    workers = [scheduler(burst=2000, ledger=ledger) for _ in range(2)]
+
+    workers[0].acquire("search.list")
+    workers[1].acquire("search.list")
+    assert ledger.spent_today() == 200
+
+    with pytest.raises(QuotaExhausted):
+        workers[0].acquire("search.list")
+    # Blocked until the reset, even for cheap calls
+    with pytest.raises(QuotaExhausted):
+        workers[0].acquire("videos.list")
+
+    workers[1].acquire("videos.list")
+    assert ledger.spent_today() == 201
+    assert workers[1].stats()["spent_today"] == 201
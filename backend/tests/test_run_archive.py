@@ -0,0 +1,104 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.models.analysis import AnalysisJob, AnalysisRun, Video
+from app.services import run_archive
+
+
+@pytest.fixture(autouse=True)
+def archive_path(tmp_path, monkeypatch):
+    monkeypatch.setattr(run_archive, "ARCHIVE_PATH", str(tmp_path))
+    return tmp_path
+
+
+def add_run(db, user_id, days_ago, engagement_rates):
+    run = AnalysisRun(
+        user_id=user_id,
+        channel_url="https://www.youtube.com/@own",
+        analyzed_at=datetime.utcnow() - timedelta(days=days_ago)
+    )
+    db.add(run)
+    db.flush()
+    db.add_all([
+        Video(
+            analysis_id=run.id,
+            video_id=f"{run.id}-{i}",
+            title=f"Video {i}",
+            source="own",
+            views=1000,
+            likes=40,
+            comments=10,
+            engagement_rate=rate
+        )
+        for i, rate in enumerate(engagement_rates)
+    ])
+    db.commit()
+    return run.id
+
+
+def test_archives_old_runs_except_latest(db):
+    old = [add_run(db, 1, 200 - i, [0.02, 0.04]) for i in range(3)]
+    recent = [add_run(db, 1, 10 - i, [0.05]) for i in range(2)]
+
+    totals = run_archive.archive_old_runs(older_than_days=90, keep_latest=2)
+
+    assert totals == {"runs": 3, "videos": 6}
+    remaining = {run_id for (run_id,) in db.query(AnalysisRun.id)}
+    assert remaining == set(recent)
+    assert db.query(Video).filter(Video.analysis_id.in_(old)).count() == 0
+
+    archived = run_archive.archived_runs(1)
+    assert [r["analysis_id"] for r in archived] == old[::-1]
+    assert archived[0]["own_total_videos"] == 2
+    assert archived[0]["own_avg_engagement"] == pytest.approx(0.03)
+
+    trend = run_archive.archived_trend(1)
+    assert [point[0] for point in trend] == old
+
+
+def test_keeps_latest_runs_even_when_old(db):
+    add_run(db, 1, 300, [0.01])
+    add_run(db, 2, 300, [0.01])
+
+    totals = run_archive.archive_old_runs(older_than_days=90, keep_latest=1)
+
+    assert totals == {"runs": 0, "videos": 0}
+    assert run_archive.archived_runs(1) == []
+
+
+def test_skips_runs_with_pending_jobs(db):
+    busy = add_run(db, 1, 200, [0.01])
+    idle = add_run(db, 1, 199, [0.01])
+    add_run(db, 1, 1, [0.01])
+    db.add(AnalysisJob(analysis_id=busy, user_id=1, status="running"))
+    db.commit()
+
+    run_archive.archive_old_runs(older_than_days=90, keep_latest=1)
+
+    assert [r["analysis_id"] for r in run_archive.archived_runs(1)] == [idle]
+    assert db.get(AnalysisRun, busy) is not None
+
+
+def test_disabled_by_default(db):
+    add_run(db, 1, 300, [0.01])
+    add_run(db, 1, 1, [0.01])
+
+    assert run_archive.archive_old_runs() == {"runs": 0, "videos": 0}
+    assert db.query(AnalysisRun).count() == 2
+
+
+def test_archived_runs_accepts_aware_datetimes(db):
+    old = add_run(db, 1, 200, [0.02])
+    add_run(db, 1, 1, [0.02])
+    run_archive.archive_old_runs(older_than_days=90, keep_latest=1)
+
+    start = datetime(2020, 1, 1, tzinfo=timezone.utc)
+    end = datetime.now(timezone(timedelta(hours=-7)))
+
+    runs = run_archive.archived_runs(1, start=start, end=end)
+    assert [r["analysis_id"] for r in runs] == [old]
+    assert [p[0] for p in run_archive.archived_trend(1, start=start)] == [old]
+
+    before = (datetime.now(timezone.utc), old + 1)
+    assert len(run_archive.archived_runs(1, before=before)) == 1
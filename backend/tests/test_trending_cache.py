@@ -0,0 +1,56 @@
+import time
+
+from app.services import trending_cache as trending
+from app.youtube.quota import QuotaExhausted, next_quota_reset
+
+
+def test_failed_fetch_is_cached_with_backoff(monkeypatch):
+    calls = []
+
+    def failing_fetch(query, **kwargs):
+        calls.append(query)
+        raise RuntimeError("backend error")
+
+    monkeypatch.setattr(
+        trending, "fetch_trending_videos_by_query", failing_fetch
+    )
+    cache = trending.TrendingCache()
+    cache._refresh(("python tips", "US"))
+
+    # Served as "no trending videos", not pending, and not re-fetched
+    assert cache.get("Python  tips", "US") == []
+    time.sleep(0.05)
+    assert calls == ["python tips"]
+
+    entry = cache._entries[("python tips", "US")]
+    assert entry["expires_at"] <= time.time() + trending.FAILURE_BACKOFF
+
+
+def test_failed_refresh_keeps_previous_videos(monkeypatch):
+    cache = trending.TrendingCache()
+    key = ("python tips", "US")
+    cache._store(key, [{"title": "old"}], ttl=-1)
+
+    def failing_fetch(query, **kwargs):
+        raise RuntimeError("backend error")
+
+    monkeypatch.setattr(
+        trending, "fetch_trending_videos_by_query", failing_fetch
+    )
+    cache._refresh(key)
+
+    assert cache._entries[key]["videos"] == [{"title": "old"}]
+    assert cache._entries[key]["expires_at"] > time.time()
+
+
+def test_quota_exhaustion_stores_nothing(monkeypatch):
+    def exhausted_fetch(query, **kwargs):
+        raise QuotaExhausted(next_quota_reset())
+
+    monkeypatch.setattr(
+        trending, "fetch_trending_videos_by_query", exhausted_fetch
+    )
+    cache = trending.TrendingCache()
+    cache._refresh(("python tips", "US"))
+
+    assert ("python tips", "US") not in cache._entries
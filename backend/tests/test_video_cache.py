@@ -0,0 +1,58 @@
+import pytest
+
+from app.youtube import youtube_fetch
+from app.youtube.response_cache import (
+    SQLiteResponseCache,
+    get_response_cache,
+    set_response_cache
+)
+
+
+@pytest.fixture
+def api_calls(tmp_path, monkeypatch):
+    previous = get_response_cache()
+    set_response_cache(SQLiteResponseCache(str(tmp_path / "cache.db")))
+
+    calls = []
+    call_api = youtube_fetch._call_api
+
+    def counting_call_api(endpoint, **params):
+        calls.append((endpoint, params))
+        return call_api(endpoint, **params)
+
+    monkeypatch.setattr(youtube_fetch, "_call_api", counting_call_api)
+    yield calls
+    set_response_cache(previous)
+
+
+def requested_ids(calls):
+    return [
+        video_id
+        for endpoint, params in calls if endpoint == "videos.list"
+        for video_id in params["id"].split(",")
+    ]
+
+
+def test_videos_are_cached_per_id(api_calls):
+    own_a = [f"UUown_a-{i}" for i in range(30)]
+    own_b = [f"UUown_b-{i}" for i in range(30)]
+    popular = [f"UUpopular-{i}" for i in range(40)]
+
+    first = youtube_fetch.fetch_video_items(own_a + popular)
+    assert [item["id"] for item in first] == own_a + popular
+
+    api_calls.clear()
+    second = youtube_fetch.fetch_video_items(own_b + popular)
+
+    # Only own_b's videos are fetched, in full 50-ID batches
+    assert sorted(requested_ids(api_calls)) == sorted(own_b)
+    assert [item["id"] for item in second] == own_b + popular
+
+
+def test_fully_cached_lookup_makes_no_call(api_calls):
+    ids = [f"UUchannel-{i}" for i in range(5)]
+    youtube_fetch.fetch_video_items(ids)
+
+    api_calls.clear()
+    assert len(youtube_fetch.fetch_video_items(ids + ids[:2])) == 5
+    assert api_calls == []
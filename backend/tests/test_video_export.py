@@ -0,0 +1,42 @@
+import json
+
+from app.models.analysis import AnalysisRun, Video
+from app.services.video_export import csv_chunks, ndjson_chunks
+
+
+def add_run(db, video_count):
+    run = AnalysisRun(user_id=1, channel_url="https://www.youtube.com/@own")
+    db.add(run)
+    db.flush()
+    db.add_all([
+        Video(
+            analysis_id=run.id, video_id=f"v{i}", source="own",
+            title=f"Video, {i}", views=100, likes=5, comments=1,
+            engagement_rate=0.06
+        )
+        for i in range(video_count)
+    ])
+    db.commit()
+    return run.id
+
+
+def test_csv_of_empty_run_is_just_the_header(db):
+    body = "".join(csv_chunks(add_run(db, 0)))
+    assert body.splitlines() == [
+        "video_id,source,title,views,likes,comments,engagement_rate"
+    ]
+
+
+def test_csv_rows_are_chunked(db):
+    chunks = list(csv_chunks(add_run(db, 5), chunk_size=2))
+    lines = "".join(chunks).splitlines()
+
+    assert len(chunks) == 3
+    assert lines[1] == 'v0,own,"Video, 0",100,5,1,0.06'
+    assert len(lines) == 6
+
+
+def test_ndjson_has_one_object_per_video(db):
+    body = "".join(ndjson_chunks(add_run(db, 3)))
+    rows = [json.loads(line) for line in body.splitlines()]
+    assert [row["video_id"] for row in rows] == ["v0", "v1", "v2"]
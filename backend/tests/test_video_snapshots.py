@@ -0,0 +1,86 @@
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+
+from app.models.analysis import VideoSnapshot, VideoStatsHead
+from app.services.video_snapshots import load_snapshots, record_snapshots
+from app.services.video_stats import velocity_metrics
+
+T0 = datetime(2026, 1, 1)
+
+
+def stats(video_id, views, likes, comments=0):
+    return {
+        "video_id": video_id, "views": views,
+        "likes": likes, "comments": comments,
+    }
+
+
+def record(db, hours, videos):
+    written = record_snapshots(
+        db, videos, captured_at=T0 + timedelta(hours=hours)
+    )
+    db.commit()
+    return written
+
+
+def test_snapshots_store_deltas_and_decode_to_counts(db):
+    record(db, 0, [stats("a", 100, 10), stats("b", 50, 5, 1)])
+    record(db, 1, [stats("a", 200, 30)])
+    record(db, 3, [stats("a", 500, 100), stats("b", 80, 6, 2)])
+
+    deltas = [
+        (s.video_id, s.views_delta, s.likes_delta, s.comments_delta)
+        for s in db.query(VideoSnapshot).order_by(
+            VideoSnapshot.video_id, VideoSnapshot.captured_at
+        )
+    ]
+    assert deltas == [
+        ("a", 100, 10, 0), ("a", 100, 20, 0), ("a", 300, 70, 0),
+        ("b", 50, 5, 1), ("b", 30, 1, 1),
+    ]
+    head = db.get(VideoStatsHead, "a")
+    assert (head.views, head.likes, head.captured_at) == (
+        500, 100, T0 + timedelta(hours=3)
+    )
+
+    series = load_snapshots(db, ["b", "a"])
+    assert list(series["video_id"]) == ["a", "a", "a", "b", "b"]
+    assert list(series["views"]) == [100, 200, 500, 50, 80]
+    assert list(series["likes"]) == [10, 30, 100, 5, 6]
+    assert list(series["comments"]) == [0, 0, 0, 1, 2]
+    assert list(series["starts"]) == [0, 3]
+
+
+def test_refetch_within_interval_is_skipped(db):
+    assert record(db, 0, [stats("a", 100, 10)]) == 1
+    assert record(db, 0.5, [stats("a", 150, 12)]) == 0
+    assert db.get(VideoStatsHead, "a").views == 100
+
+
+def test_velocity_metrics(db):
+    record(db, 0, [stats("a", 100, 10), stats("b", 50, 5)])
+    record(db, 1, [stats("a", 200, 30)])
+    record(db, 3, [stats("a", 500, 100)])
+
+    metrics = velocity_metrics(load_snapshots(db, ["a", "b"]))
+
+    assert list(metrics["video_id"]) == ["a", "b"]
+    assert list(metrics["snapshots"]) == [3, 1]
+    # (500 - 200) views over the last 2 hours
+    assert metrics["views_per_hour"][0] == pytest.approx(150)
+    # Engagement 0.10 -> 0.15 -> 0.20: slope 0.05/h, then 0.025/h,
+    # over a 1.5h mean interval
+    assert metrics["engagement_acceleration"][0] == pytest.approx(
+        (0.025 - 0.05) / 1.5
+    )
+    # One snapshot: no growth to measure
+    assert np.isnan(metrics["views_per_hour"][1])
+    assert np.isnan(metrics["engagement_acceleration"][1])
+
+
+def test_velocity_metrics_without_snapshots(db):
+    metrics = velocity_metrics(load_snapshots(db, ["missing"]))
+    assert len(metrics["video_id"]) == 0
+    assert len(metrics["views_per_hour"]) == 0